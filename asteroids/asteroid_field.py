@@ -0,0 +1,184 @@
+# Struct-of-arrays store for the asteroid field.
+# Heading and speed never change after a rock is spawned, so its velocity is
+# worked out once; moving and wrapping the whole field is then a handful of
+# vectorized ops instead of per-rock trig and bounds checks.
+import math
+import random
+import numpy as np
+import pygame
+
+
+class AsteroidField:
+    def __init__(self, width, height, speed, capacity=64, rng=random):
+        self.width = width
+        self.height = height
+        self.speed = speed    # speed of a size-40 rock; smaller rocks are slower
+        self.rng = rng        # a random.Random, or the random module itself
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int64)
+        self.split = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Top-left of each rock's size x size collision box, rounded the way
+        # pygame.Rect rounds a float centre
+        self.left = np.zeros(capacity, dtype=np.int64)
+        self.top = np.zeros(capacity, dtype=np.int64)
+        self.reach = np.zeros(capacity)  # distance to the furthest vertex
+        self.points = []      # polygon offsets from the centre, per slot
+        # Outlines are keyed by their vertex radii. Each key is rasterized
+        # once and shared by every rock with that outline; the sprite is
+        # dropped when the last of those rocks is destroyed.
+        self.shapes = []      # shape key per slot
+        self.users = {}       # shape key -> live rocks using it
+        self.sprites = {}     # shape key -> (surface, offset of its centre)
+        self.world = {}       # slot -> outline in world space, until the next move
+        self.count = 0        # slots in use, dead or alive
+        self.dirty = False    # kill() leaves holes until compact()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def _grow(self):
+        capacity = len(self.x) * 2
+        for name in ("x", "y", "vx", "vy", "size", "split", "alive", "left", "top", "reach"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, size=None, split=False):
+        # A new rock with a random size (unless given), heading, jagged
+        # outline and position
+        rng = self.rng
+        size = size if size else rng.randint(30, 40)
+        speed = self.speed * (size / 40)
+        angle = rng.randint(0, 360)
+        num_vertices = rng.randint(6, 10)
+        shape = tuple(size // 2 + rng.randint(-size // 4, size // 4) for _ in range(num_vertices))
+        points = outline(shape)
+        x = rng.randint(0, self.width)
+        y = rng.randint(0, self.height)
+
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = math.cos(math.radians(angle)) * speed
+        self.vy[i] = math.sin(math.radians(angle)) * speed
+        self.size[i] = size
+        self.split[i] = split
+        self.alive[i] = True
+        self.left[i] = x - size // 2
+        self.top[i] = y - size // 2
+        self.reach[i] = max(shape)
+        self.points.append(points)
+        self.shapes.append(shape)
+        self.users[shape] = self.users.get(shape, 0) + 1
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        self.alive[i] = False
+        self.dirty = True
+
+    def compact(self):
+        # Drop killed rocks, keeping the survivors in spawn order
+        if not self.dirty:
+            return
+        n = self.count
+        for i in np.flatnonzero(~self.alive[:n]).tolist():
+            shape = self.shapes[i]
+            self.users[shape] -= 1
+            if not self.users[shape]:
+                del self.users[shape]
+                self.sprites.pop(shape, None)
+        keep = np.flatnonzero(self.alive[:n])
+        m = len(keep)
+        for name in ("x", "y", "vx", "vy", "size", "split", "left", "top", "reach"):
+            arr = getattr(self, name)
+            arr[:m] = arr[keep]
+        self.alive[:m] = True
+        self.alive[m:n] = False
+        keep = keep.tolist()
+        self.points = [self.points[i] for i in keep]
+        self.shapes = [self.shapes[i] for i in keep]
+        self.count = m
+        self.dirty = False
+        self.world.clear()
+
+    def move(self):
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.vx[:n]
+        y += self.vy[:n]
+        # Past an edge, jump to the opposite edge
+        for coord, limit in ((x, self.width), (y, self.height)):
+            low = coord < 0
+            high = coord > limit
+            coord[low] = limit
+            coord[high] = 0
+        half = self.size[:n] // 2
+        self.left[:n] = rounded(x) - half
+        self.top[:n] = rounded(y) - half
+        self.world.clear()
+
+    def vertices(self, i):
+        # Rock i's outline in world space, worked out on first use each frame
+        vertices = self.world.get(i)
+        if vertices is None:
+            x = float(self.x[i])
+            y = float(self.y[i])
+            vertices = self.world[i] = [(x + px, y + py) for px, py in self.points[i]]
+        return vertices
+
+    def draw(self, surface, color):
+        # One blit per rock, centred on its rounded position
+        n = self.count
+        sprites = self.sprites
+        xs = (self.left[:n] + self.size[:n] // 2).tolist()
+        ys = (self.top[:n] + self.size[:n] // 2).tolist()
+        blits = []
+        for x, y, shape in zip(xs, ys, self.shapes):
+            sprite = sprites.get(shape)
+            if sprite is None:
+                sprite = sprites[shape] = render_shape(outline(shape), color)
+            image, offset = sprite
+            blits.append((image, (x - offset, y - offset)))
+        surface.blits(blits, doreturn=False)
+
+
+def outline(shape):
+    # Polygon offsets for a shape key: one vertex per radius, evenly spaced
+    # around the centre
+    count = len(shape)
+    points = []
+    for i, radius in enumerate(shape):
+        rad_angle = math.radians(i * (360 / count))
+        points.append((math.cos(rad_angle) * radius, math.sin(rad_angle) * radius))
+    return points
+
+
+def render_shape(points, color):
+    # Rasterize an outline onto a colour-keyed surface; returns the surface
+    # and the offset of the centre within it
+    offset = math.ceil(max(math.hypot(px, py) for px, py in points)) + 1
+    image = pygame.Surface((2 * offset + 1, 2 * offset + 1))
+    pygame.draw.polygon(image, color, [(offset + px, offset + py) for px, py in points])
+    if pygame.display.get_surface():
+        image = image.convert()
+    image.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    return image, offset
+
+
+def rounded(values):
+    # Nearest integer with halves away from zero, as pygame.Rect does
+    magnitude = np.abs(values)
+    whole = np.floor(magnitude)
+    return np.copysign(whole + (magnitude - whole >= 0.5), values).astype(np.int64)
@@ -0,0 +1,163 @@
+# Narrow-phase collision tests for Asteroids, at three precisions:
+#   box     - the rock's size x size rect against the laser rect or the
+#             ship's box (the original test)
+#   circle  - squared distance between centres against the rock's nominal
+#             radius (size / 2); no square roots and no rect updates
+#   polygon - a squared-distance reject against the rock's furthest vertex,
+#             then an exact test against its outline in world space: the
+#             laser's path this frame, or the ship's triangle
+# None of them wrap around the screen edges.
+import numpy as np
+
+PRECISIONS = ("box", "circle", "polygon")
+LASER_RADIUS = 3  # half the laser's width
+
+
+class NarrowPhase:
+    def __init__(self, precision="box"):
+        self.precision = precision
+        self.field = None
+
+    def prepare(self, field):
+        # Snapshot the field for this frame's checks; returns the broad-phase
+        # boxes (lefts, tops, rights, bottoms) that cover each rock's shape
+        self.field = field
+        n = field.count
+        size = field.size[:n]
+        self.sizes = size.tolist()
+        if self.precision == "box":
+            boxes = (field.left[:n], field.top[:n], field.left[:n] + size, field.top[:n] + size)
+            self.lefts, self.tops, self.rights, self.bottoms = (side.tolist() for side in boxes)
+            return boxes
+        x = field.x[:n]
+        y = field.y[:n]
+        self.xs = x.tolist()
+        self.ys = y.tolist()
+        self.reaches = field.reach[:n].tolist()
+        reach = np.maximum(field.reach[:n], size / 2)
+        return (np.floor(x - reach).astype(np.int64), np.floor(y - reach).astype(np.int64),
+                np.ceil(x + reach).astype(np.int64), np.ceil(y + reach).astype(np.int64))
+
+    def laser_box(self, laser):
+        if self.precision == "box":
+            rect = laser.rect
+            return rect.left, rect.top, rect.right, rect.bottom
+        if self.precision == "circle":
+            return (laser.x - LASER_RADIUS, laser.y - LASER_RADIUS,
+                    laser.x + LASER_RADIUS, laser.y + LASER_RADIUS)
+        start_x = laser.x - laser.velocity_x
+        start_y = laser.y - laser.velocity_y
+        return min(start_x, laser.x), min(start_y, laser.y), max(start_x, laser.x), max(start_y, laser.y)
+
+    def laser_hits(self, laser, i):
+        precision = self.precision
+        if precision == "box":
+            rect = laser.rect
+            return (rect.left < self.rights[i] and self.lefts[i] < rect.right and
+                    rect.top < self.bottoms[i] and self.tops[i] < rect.bottom)
+        x, y = self.xs[i], self.ys[i]
+        if precision == "circle":
+            reach = self.sizes[i] / 2 + LASER_RADIUS
+            dx = laser.x - x
+            dy = laser.y - y
+            return dx * dx + dy * dy <= reach * reach
+        # The path from last frame's position, so fast lasers can't skip
+        # over small fragments
+        start_x = laser.x - laser.velocity_x
+        start_y = laser.y - laser.velocity_y
+        reach = self.reaches[i]
+        if segment_distance_squared(x, y, start_x, start_y, laser.x, laser.y) > reach * reach:
+            return False
+        vertices = self.field.vertices(i)
+        return (point_in_polygon(laser.x, laser.y, vertices) or
+                segment_crosses_polygon(start_x, start_y, laser.x, laser.y, vertices))
+
+    def ship_box(self, ship):
+        if self.precision == "polygon":
+            reach = max(ship.height, ship.width / 2)
+            return ship.x - reach, ship.y - reach, ship.x + reach, ship.y + reach
+        half_width = ship.width // 2
+        half_height = ship.height // 2
+        return ship.x - half_width, ship.y - half_height, ship.x + half_width, ship.y + half_height
+
+    def ship_hits(self, ship, i):
+        precision = self.precision
+        if precision == "box":
+            half_width = ship.width // 2
+            half_height = ship.height // 2
+            return (ship.x + half_width > self.lefts[i] and ship.x - half_width < self.rights[i] and
+                    ship.y + half_height > self.tops[i] and ship.y - half_height < self.bottoms[i])
+        dx = ship.x - self.xs[i]
+        dy = ship.y - self.ys[i]
+        if precision == "circle":
+            reach = self.sizes[i] / 2 + ship.width / 2
+            return dx * dx + dy * dy <= reach * reach
+        reach = self.reaches[i] + max(ship.height, ship.width / 2)
+        if dx * dx + dy * dy > reach * reach:
+            return False
+        return polygons_overlap(ship.points(), self.field.vertices(i))
+
+
+def segment_distance_squared(px, py, ax, ay, bx, by):
+    # Squared distance from point p to the segment a-b
+    abx = bx - ax
+    aby = by - ay
+    length = abx * abx + aby * aby
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((px - ax) * abx + (py - ay) * aby) / length))
+    dx = ax + t * abx - px
+    dy = ay + t * aby - py
+    return dx * dx + dy * dy
+
+
+def point_in_polygon(x, y, vertices):
+    # Even-odd rule
+    inside = False
+    x1, y1 = vertices[-1]
+    for x2, y2 in vertices:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+    # True if segments a-b and c-d intersect (touching counts)
+    d1 = cross(cx, cy, dx, dy, ax, ay)
+    d2 = cross(cx, cy, dx, dy, bx, by)
+    d3 = cross(ax, ay, bx, by, cx, cy)
+    d4 = cross(ax, ay, bx, by, dx, dy)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    # An endpoint lying on the other segment
+    return ((d1 == 0 and within(cx, cy, dx, dy, ax, ay)) or (d2 == 0 and within(cx, cy, dx, dy, bx, by)) or
+            (d3 == 0 and within(ax, ay, bx, by, cx, cy)) or (d4 == 0 and within(ax, ay, bx, by, dx, dy)))
+
+
+def cross(px, py, qx, qy, rx, ry):
+    # Which side of the line p-q the point r is on (0 if on it)
+    return (qx - px) * (ry - py) - (qy - py) * (rx - px)
+
+
+def within(px, py, qx, qy, rx, ry):
+    # For r on the line p-q: whether it lies between p and q
+    return min(px, qx) <= rx <= max(px, qx) and min(py, qy) <= ry <= max(py, qy)
+
+
+def segment_crosses_polygon(ax, ay, bx, by, vertices):
+    x1, y1 = vertices[-1]
+    for x2, y2 in vertices:
+        if segments_cross(ax, ay, bx, by, x1, y1, x2, y2):
+            return True
+        x1, y1 = x2, y2
+    return False
+
+
+def polygons_overlap(a, b):
+    # Overlap of two simple polygons: an edge of one crosses an edge of the
+    # other, or one lies entirely inside the other
+    x1, y1 = a[-1]
+    for x2, y2 in a:
+        if segment_crosses_polygon(x1, y1, x2, y2, b):
+            return True
+        x1, y1 = x2, y2
+    return point_in_polygon(*a[0], b) or point_in_polygon(*b[0], a)
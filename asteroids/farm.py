@@ -0,0 +1,150 @@
+# Headless episode farm: plays many seeded rounds per difficulty across a
+# process pool and collects one record per round (score, lives lost, peak rock
+# count and per-step timing) into a columnar .npz file, one array per field,
+# then prints the worst seeds so pathological rock counts and frame-time
+# spikes stand out.
+#
+#   python farm.py --seeds 2000 --policy scripted --output farm.npz
+#
+#   results = np.load("farm.npz")
+#   results["seed"][results["max_ms"] > 16]
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+import numpy as np
+from game import Game, Actions, DIFFICULTIES, LIVES, FPS
+from collision import PRECISIONS
+
+FIELDS = ["difficulty", "seed", "policy", "collisions", "frames", "seconds", "score", "won",
+          "lives_lost", "peak_asteroids", "mean_ms", "p95_ms", "max_ms"]
+
+
+def random_policy(game, rng):
+    return Actions(rng.random() < 0.3, rng.random() < 0.3, rng.random() < 0.3, rng.random() < 0.5)
+
+
+def scripted_policy(game, rng):
+    # Turn towards the nearest rock and fire on alternate frames once roughly
+    # lined up (the fire key has to be released between shots)
+    ship = game.spaceship
+    field = game.asteroids
+    n = field.count
+    if not n:
+        return Actions()
+    dx = field.x[:n] - ship.x
+    dy = field.y[:n] - ship.y
+    i = int((dx * dx + dy * dy).argmin())
+    # Screen y points down, ship angles are counter-clockwise
+    target = math.degrees(math.atan2(-dy[i], dx[i]))
+    turn = (target - ship.angle + 180) % 360 - 180
+    return Actions(left=turn > 5, right=turn < -5, thrust=False,
+                   fire=abs(turn) < 15 and game.frame % 2 == 0)
+
+
+POLICIES = {"random": random_policy, "scripted": scripted_policy}
+
+
+def save_columns(path, columns):
+    # One array per field. Written to a temporary file and renamed over the
+    # output, so a reader never sees a half-written file
+    part = path + ".part"
+    with open(part, "wb") as f:
+        np.savez(f, **{name: np.array(values) for name, values in columns.items()})
+    os.replace(part, path)
+
+
+def run_episode(job):
+    difficulty, seed, policy_name, precision, max_frames = job
+    game = Game(difficulty, seed=seed, precision=precision)
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed * 7919 + list(DIFFICULTIES).index(difficulty))
+    peak = game.asteroids.count
+    step_times = []
+    clock = time.perf_counter
+    while not game.over and game.frame < max_frames:
+        actions = policy(game, rng)
+        start = clock()
+        game.step(actions)
+        step_times.append(clock() - start)
+        peak = max(peak, game.asteroids.count)
+    step_times.sort()
+    n = len(step_times)
+    return {
+        "difficulty": difficulty,
+        "seed": seed,
+        "policy": policy_name,
+        "collisions": precision,
+        "frames": game.frame,
+        "seconds": round(game.frame / FPS, 2),
+        "score": game.score,
+        "won": int(game.won),
+        "lives_lost": LIVES - max(game.lives, 0),
+        "peak_asteroids": peak,
+        "mean_ms": round(sum(step_times) / n * 1000, 4) if n else 0,
+        "p95_ms": round(step_times[min(n - 1, int(n * 0.95))] * 1000, 4) if n else 0,
+        "max_ms": round(step_times[-1] * 1000, 4) if n else 0,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run seeded headless Asteroids rounds across a process pool")
+    parser.add_argument("--difficulties", nargs="+", choices=list(DIFFICULTIES), default=list(DIFFICULTIES))
+    parser.add_argument("--seeds", type=int, default=1000, help="rounds per difficulty")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--collisions", choices=PRECISIONS, default="box")
+    parser.add_argument("--max-frames", type=int, default=FPS * 60 * 5, help="cap per round (default 5 minutes)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", default="farm.npz")
+    parser.add_argument("--save-every", type=int, default=500, help="rounds between checkpoints of the output")
+    parser.add_argument("--top", type=int, default=5, help="worst seeds to list per difficulty")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    jobs = [(difficulty, seed, args.policy, args.collisions, args.max_frames)
+            for difficulty in args.difficulties
+            for seed in range(args.first_seed, args.first_seed + args.seeds)]
+
+    # Records are appended to the columns as rounds finish, and the output is
+    # rewritten every --save-every rounds, so a long run can be inspected (or
+    # killed) part way through without losing finished work
+    start = time.perf_counter()
+    results = []
+    columns = {name: [] for name in FIELDS}
+    with multiprocessing.Pool(args.workers) as pool:
+        for result in pool.imap_unordered(run_episode, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))):
+            results.append(result)
+            for name in FIELDS:
+                columns[name].append(result[name])
+            if len(results) % args.save_every == 0:
+                save_columns(args.output, columns)
+    elapsed = time.perf_counter() - start
+
+    # The finished file is in difficulty then seed order
+    order = list(DIFFICULTIES)
+    results.sort(key=lambda r: (order.index(r["difficulty"]), r["seed"]))
+    save_columns(args.output, {name: [r[name] for r in results] for name in FIELDS})
+
+    total_frames = sum(r["frames"] for r in results)
+    print(f"{len(results)} rounds, {total_frames} steps in {elapsed:.1f}s "
+          f"({total_frames / elapsed:.0f} steps/s) -> {args.output}")
+    for difficulty in args.difficulties:
+        runs = [r for r in results if r["difficulty"] == difficulty]
+        print(f"  {difficulty}: "
+              f"survival {sum(r['seconds'] for r in runs) / len(runs):.1f}s, "
+              f"score {sum(r['score'] for r in runs) / len(runs):.0f}, "
+              f"lives lost {sum(r['lives_lost'] for r in runs) / len(runs):.2f}, "
+              f"wins {sum(r['won'] for r in runs)}/{len(runs)}")
+        by_peak = sorted(runs, key=lambda r: (-r["peak_asteroids"], r["seed"]))[:args.top]
+        print("    most rocks: " + ", ".join(f"seed {r['seed']} ({r['peak_asteroids']})" for r in by_peak))
+        by_spike = sorted(runs, key=lambda r: (-r["max_ms"], r["seed"]))[:args.top]
+        print("    worst steps: " + ", ".join(f"seed {r['seed']} ({r['max_ms']:.2f}ms)" for r in by_spike))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# Headless Asteroids simulation.
+# Game holds the spaceship, lasers, asteroid field, score and lives, and
+# step() advances it by one frame from the player's actions. Nothing here
+# opens a window (pygame is only used for Rect), so rounds can be run at
+# unlimited speed for soak tests and benchmarks.
+#
+#   game = Game()
+#   game.reset(seed=1, difficulty="hard")
+#   while not game.over:
+#       game.step(Actions(left=True, fire=True))
+import math
+import random
+import pygame
+from asteroid_field import AsteroidField
+from collision import NarrowPhase
+from spatial_grid import SpatialGrid
+
+WIDTH, HEIGHT = 800, 600
+FPS = 60
+
+# Game settings
+SPACESHIP_ACCELERATION = 0.12
+SPACESHIP_FRICTION = 0.98
+LASER_SPEED = 12
+# Lasers don't wrap, so no shot can stay on screen for longer than the
+# screen diagonal; the lifetime only backstops off_screen() and never cuts a
+# shot short
+LASER_RANGE = math.ceil(math.hypot(WIDTH, HEIGHT))  # pixels
+LASER_LIFETIME = -(-LASER_RANGE // LASER_SPEED)  # frames, rounded up
+LASER_CAPACITY = 32  # lasers in flight at once
+LIVES = 3
+
+# Difficulty presets: rock speed, starting rocks, and whether the ship always
+# thrusts forward
+DIFFICULTIES = {
+    "easy": {"speed": 2, "asteroids": 4, "thrust": False},
+    "normal": {"speed": 3, "asteroids": 6, "thrust": False},
+    "hard": {"speed": 4, "asteroids": 8, "thrust": False},
+    "extreme": {"speed": 4, "asteroids": 8, "thrust": True},
+}
+
+# Direction table. The ship only ever turns in 5 degree steps, so the unit
+# vector for every heading (screen space, y pointing down) is worked out once;
+# look one up with heading(angle)
+HEADING_STEP = 5
+DIRECTIONS = [(math.cos(math.radians(angle)), -math.sin(math.radians(angle)))
+              for angle in range(0, 360, HEADING_STEP)]
+
+def heading(angle):
+    return angle // HEADING_STEP % len(DIRECTIONS)
+
+def ship_outlines(nose, half_base):
+    # Triangle vertex offsets from the ship's centre for every heading: the
+    # nose, then the two rear corners 120 degrees either side
+    outlines = []
+    for angle in range(0, 360, HEADING_STEP):
+        outline = []
+        for turn, length in ((0, nose), (120, half_base), (-120, half_base)):
+            rad_angle = math.radians(angle + turn)
+            outline.append((math.cos(rad_angle) * length, -math.sin(rad_angle) * length))
+        outlines.append(outline)
+    return outlines
+
+# What the player does in one frame (the keys held down)
+class Actions:
+    def __init__(self, left=False, right=False, thrust=False, fire=False):
+        self.left = left
+        self.right = right
+        self.thrust = thrust
+        self.fire = fire
+
+# Spaceship class
+class Spaceship:
+    def __init__(self, width=30, height=30):
+        self.width = width
+        self.height = height
+        self.outlines = ship_outlines(height, width / 2)
+        self.reset()
+
+    def reset(self):
+        self.x = WIDTH // 2
+        self.y = HEIGHT // 2
+        self.angle = 90
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.invincible = False
+        self.state = "alive"  # can be 'alive', 'respawning'
+        self.respawn_timer = 0
+        self.invincibility_timer = 0
+
+    def start_respawn(self):
+        self.state = "respawning"
+        self.respawn_timer = FPS  # 1 second countdown
+        self.invincible = True
+        self.invincibility_timer = 120  # 2 seconds invincibility
+
+    def move(self, actions, always_thrust=False):
+        if self.state != "alive":
+            return  # Prevent moving while respawning
+
+        # Rotation
+        if actions.left:
+            self.angle += 5
+        if actions.right:
+            self.angle -= 5
+
+        # Movement (forward) logic. In Extreme mode, always move forward in
+        # the direction of the spaceship's angle
+        if always_thrust or actions.thrust:
+            dx, dy = DIRECTIONS[heading(self.angle)]
+            self.velocity_x += dx * SPACESHIP_ACCELERATION
+            self.velocity_y += dy * SPACESHIP_ACCELERATION
+
+        # Apply friction
+        self.velocity_x *= SPACESHIP_FRICTION
+        self.velocity_y *= SPACESHIP_FRICTION
+
+        # Update position
+        self.x += self.velocity_x
+        self.y += self.velocity_y
+
+        # Wrap around the screen if out of bounds
+        if self.x < 0: self.x = WIDTH
+        elif self.x > WIDTH: self.x = 0
+        if self.y < 0: self.y = HEIGHT
+        elif self.y > HEIGHT: self.y = 0
+
+    def update(self):
+        if self.state == "respawning":
+            self.respawn_timer -= 1
+            self.invincibility_timer -= 1
+            if self.respawn_timer <= 0:
+                self.state = "alive"
+            if self.invincibility_timer <= 0:
+                self.invincible = False
+
+    def points(self):
+        # The ship's triangle in world space
+        return [(self.x + dx, self.y + dy) for dx, dy in self.outlines[heading(self.angle)]]
+
+    def get_countdown_number(self):
+        if self.state == "respawning":
+            return max(1, int(self.respawn_timer * 3 / FPS))
+        return 0
+
+# Laser class. Lasers are reused through LaserPool, so the constructor only
+# sets up the rect and launch() does the per-shot work
+class Laser:
+    width = 6
+    height = 14
+
+    def __init__(self):
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.velocity = LASER_SPEED
+
+    def launch(self, x, y, angle):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.rect.center = (x, y)
+        # The heading never changes, so the velocity is fixed at spawn
+        dx, dy = DIRECTIONS[heading(angle)]
+        self.velocity_x = dx * self.velocity
+        self.velocity_y = dy * self.velocity
+        self.age = 0
+        self.spent = False
+
+    def update(self):
+        self.x += self.velocity_x
+        self.y += self.velocity_y
+        self.rect.center = (self.x, self.y)
+        self.age += 1
+
+    def off_screen(self):
+        return self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT
+
+    def expired(self):
+        return self.age >= LASER_LIFETIME or self.off_screen()
+
+# Preallocated lasers. Spent lasers are only flagged; compact() then drops
+# them all in one O(n) pass, keeping the rest in firing order. When every
+# laser is in flight, fire() does nothing.
+class LaserPool:
+    def __init__(self, capacity=LASER_CAPACITY):
+        self.items = []
+        self.free = [Laser() for _ in range(capacity)]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def fire(self, x, y, angle):
+        if not self.free:
+            return None
+        laser = self.free.pop()
+        laser.launch(x, y, angle)
+        self.items.append(laser)
+        return laser
+
+    def release(self, laser):
+        laser.spent = True
+
+    def compact(self):
+        live = []
+        for laser in self.items:
+            if laser.spent:
+                self.free.append(laser)
+            else:
+                live.append(laser)
+        self.items = live
+
+# One round of Asteroids
+class Game:
+    def __init__(self, difficulty="normal", seed=None, precision="box"):
+        self.grid = SpatialGrid(WIDTH, HEIGHT)  # Broad phase, rebuilt every frame
+        self.narrow = NarrowPhase(precision)
+        self.difficulty_level = difficulty
+        self.reset(seed)
+
+    def reset(self, seed=None, difficulty=None):
+        # Starts a new round, keeping the current difficulty unless one is
+        # given. All randomness comes from this stream, so a seed plus the
+        # actions of every frame reproduces a round exactly
+        if difficulty is not None:
+            self.difficulty_level = difficulty
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        preset = DIFFICULTIES[self.difficulty_level]
+        self.asteroids = AsteroidField(WIDTH, HEIGHT, preset["speed"], rng=self.rng)
+        for _ in range(preset["asteroids"]):
+            self.asteroids.spawn()
+        self.spaceship = Spaceship()
+        self.lasers = LaserPool()
+        self.score = 0
+        self.lives = LIVES
+        self.space_released = True
+        self.frame = 0
+        self.over = False
+        self.won = False
+
+    def step(self, actions):
+        if self.over:
+            return
+        spaceship = self.spaceship
+        lasers = self.lasers
+        asteroids = self.asteroids
+        grid = self.grid
+        narrow = self.narrow
+        self.frame += 1
+
+        spaceship.move(actions, DIFFICULTIES[self.difficulty_level]["thrust"])
+        spaceship.update()
+
+        # Shooting: one shot per press of the fire key
+        if actions.fire and self.space_released and spaceship.state == "alive":
+            lasers.fire(spaceship.x, spaceship.y, spaceship.angle)
+            self.space_released = False
+        if not actions.fire:
+            self.space_released = True
+
+        # Bucket the asteroids by grid cell; they don't move until after the
+        # collision checks, so one build serves the ship and every laser
+        grid.build(*narrow.prepare(asteroids))
+        sizes = narrow.sizes
+
+        # Collision with asteroids (only if the spaceship is alive). Losing
+        # the last life ends the round on the spot.
+        if spaceship.state == "alive":
+            for i in grid.query(*narrow.ship_box(spaceship)):
+                if narrow.ship_hits(spaceship, i):
+                    self.lives -= 1
+                    if self.lives <= 0:
+                        self.over = True
+                        return
+                    spaceship.start_respawn()
+                    break
+
+        # Lasers vs asteroids. Fragments are spawned straight into the field but
+        # aren't in the grid, so they can't be hit until next frame.
+        for laser in lasers:
+            laser.update()
+            if laser.expired():
+                lasers.release(laser)  # Still hits anything it reached this frame
+            for i in grid.query(*narrow.laser_box(laser)):
+                if narrow.laser_hits(laser, i):
+                    lasers.release(laser)
+                    asteroids.kill(i)
+                    self.score += 10
+                    if not asteroids.split[i] and sizes[i] > 15:
+                        for _ in range(2):
+                            asteroids.spawn(size=sizes[i] // 2, split=True)  # Random position
+
+        lasers.compact()
+        asteroids.compact()
+        asteroids.move()
+
+        # Win condition
+        if not asteroids:
+            self.over = True
+            self.won = True
@@ -0,0 +1,61 @@
+# Uniform-grid broad phase for Asteroids collisions.
+# Asteroids are registered by index in every cell their box overlaps, and a
+# query returns the indices sharing a cell with the query box, in index order,
+# so callers behave exactly like a scan over the whole field. Cells wrap around
+# the screen edges like the objects do: a box hanging off one edge lands in the
+# cells on the opposite side too.
+import numpy as np
+
+
+class SpatialGrid:
+    def __init__(self, width, height, cell_size=64):
+        self.cell_size = cell_size
+        self.cols = max(1, -(-width // cell_size))
+        self.rows = max(1, -(-height // cell_size))
+        self.entries = []  # indices grouped by cell, ascending within a cell
+        self.starts = [0] * (self.cols * self.rows + 1)  # cell k is entries[starts[k]:starts[k + 1]]
+
+    def _cells(self, left, top, right, bottom):
+        # Every cell key the box touches, wrapping past the screen edges
+        size = self.cell_size
+        cols, rows = self.cols, self.rows
+        x0 = int(left // size)
+        x1 = min(int(right // size), x0 + cols - 1)
+        y0 = int(top // size)
+        y1 = min(int(bottom // size), y0 + rows - 1)
+        return [(cy % rows) * cols + cx % cols for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def build(self, lefts, tops, rights, bottoms):
+        # lefts..bottoms are integer arrays with one box per index. The cell
+        # keys of every box are found with array ops, then one sort groups
+        # the indices by cell.
+        size = self.cell_size
+        cols, rows = self.cols, self.rows
+        x0 = lefts // size
+        y0 = tops // size
+        x1 = np.minimum(rights // size, x0 + cols - 1)
+        y1 = np.minimum(bottoms // size, y0 + rows - 1)
+        index = np.arange(len(lefts))
+        keys = []
+        indices = []
+        for dy in range(int((y1 - y0).max(initial=0)) + 1):
+            for dx in range(int((x1 - x0).max(initial=0)) + 1):
+                covered = (x0 + dx <= x1) & (y0 + dy <= y1)
+                keys.append((((y0 + dy) % rows) * cols + (x0 + dx) % cols)[covered])
+                indices.append(index[covered])
+        keys = np.concatenate(keys)
+        indices = np.concatenate(indices)
+        order = np.lexsort((indices, keys))
+        self.entries = indices[order].tolist()
+        self.starts = np.searchsorted(keys[order], np.arange(cols * rows + 1)).tolist()
+
+    def query(self, left, top, right, bottom):
+        entries, starts = self.entries, self.starts
+        keys = self._cells(left, top, right, bottom)
+        if len(keys) == 1:
+            key = keys[0]
+            return entries[starts[key]:starts[key + 1]]
+        found = set()
+        for key in keys:
+            found.update(entries[starts[key]:starts[key + 1]])
+        return sorted(found)
@@ -0,0 +1,82 @@
+# Sprite atlas. Every sprite is scaled once and packed into a single strip,
+# which is saved to CACHE_DIR along with the source files' mtimes. Later runs
+# load that one PNG instead of decoding and scaling ten, and the atlas is
+# converted to the display's pixel format so blits skip per-pixel conversion.
+import json
+import os
+import pygame
+
+CACHE_DIR = ".sprite_cache"
+CACHE_IMAGE = os.path.join(CACHE_DIR, "atlas.png")
+CACHE_MANIFEST = os.path.join(CACHE_DIR, "atlas.json")
+
+# name, source file, scaled size
+SPRITES = [
+    ("player", "player.png", (30, 20)),
+    ("invader", "invader.png", (30, 20)),
+    ("ufo", "ufo.png", (40, 15)),
+    ("exp", "exp.png", (30, 30)),
+    # Special alien images
+    ("kamikaze", "kamikaze.png", (30, 20)),
+    ("shield", "shield.png", (30, 20)),
+    ("zigzag", "zigzag.png", (30, 20)),
+    ("sniper", "sniper.png", (30, 20)),
+    ("spawner", "spawner.png", (30, 20)),
+    ("mini", "mini.png", (15, 10)),
+]
+
+
+def manifest():
+    # What the cached atlas was built from: any changed file or size rebuilds it
+    return {
+        "sprites": [[name, path, list(size), os.stat(path).st_mtime_ns] for name, path, size in SPRITES],
+    }
+
+
+def pack():
+    # Lay the scaled sprites out left to right; returns (atlas, {name: rect})
+    width = sum(size[0] for _, _, size in SPRITES)
+    height = max(size[1] for _, _, size in SPRITES)
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    rects = {}
+    x = 0
+    for name, path, size in SPRITES:
+        atlas.blit(pygame.transform.scale(pygame.image.load(path), size), (x, 0))
+        rects[name] = pygame.Rect((x, 0), size)
+        x += size[0]
+    return atlas, rects
+
+
+def load_cached(expected):
+    try:
+        with open(CACHE_MANIFEST) as f:
+            cached = json.load(f)
+        if cached["sources"] != expected:
+            return None
+        atlas = pygame.image.load(CACHE_IMAGE)
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+    return atlas, {name: pygame.Rect(rect) for name, rect in cached["rects"].items()}
+
+
+def save_cache(expected, atlas, rects):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        pygame.image.save(atlas, CACHE_IMAGE)
+        with open(CACHE_MANIFEST, "w") as f:
+            json.dump({"sources": expected, "rects": {name: list(rect) for name, rect in rects.items()}}, f)
+    except (OSError, pygame.error):
+        pass  # A read-only checkout just rebuilds the atlas every run
+
+
+def load_atlas():
+    # Needs a display mode set first, for convert_alpha(). Returns
+    # {name: subsurface} views into the one converted atlas surface.
+    expected = manifest()
+    loaded = load_cached(expected)
+    if loaded is None:
+        loaded = pack()
+        save_cache(expected, *loaded)
+    atlas, rects = loaded
+    atlas = atlas.convert_alpha()
+    return {name: atlas.subsurface(rect) for name, rect in rects.items()}
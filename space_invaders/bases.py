@@ -0,0 +1,87 @@
+# Defensive bases stored as a fixed occupancy bitmap: each base is a 3x8 grid
+# of 8 px blocks with an opening cut into the bottom row. Lookups, damage
+# counts and the regen-slot search are all constant time per base.
+import math
+
+BLOCK = 8
+ROWS = 3
+COLS = 8
+
+
+class Bases:
+    def __init__(self, top, count=4, left=150, spacing=150):
+        self.top = top
+        self.bottom = top + ROWS * BLOCK
+        self.count = count
+        self.lefts = [left + i * spacing for i in range(count)]
+        self.cell_x = []
+        self.cell_y = []
+        self.valid = []
+        for i in range(count):
+            for row in range(ROWS):
+                for col in range(COLS):
+                    self.cell_x.append(self.lefts[i] + col * BLOCK)
+                    self.cell_y.append(top + row * BLOCK)
+                    self.valid.append(not (row == 2 and 2 <= col <= 5))  # Opening at bottom
+        self.alive = list(self.valid)
+        # Build-order stamps: when a projectile overlaps several blocks, the
+        # oldest one goes first, and regrown blocks count as the newest
+        self.order = []
+        for valid in self.valid:
+            self.order.append(len(self.order) if valid else None)
+        self.next_order = len(self.order)
+        self.blocks = [sum(self.valid[i * ROWS * COLS:(i + 1) * ROWS * COLS]) for i in range(count)]
+
+    def __len__(self):
+        return sum(self.blocks)
+
+    def __iter__(self):
+        for cell, alive in enumerate(self.alive):
+            if alive:
+                yield self.cell_x[cell], self.cell_y[cell]
+
+    def hit(self, x, y, w, h, upward=None):
+        # Remove the first block overlapping the box; True if one was hit.
+        # For a swept box, upward gives the direction of travel and the row
+        # reached first is searched first
+        if y + h <= self.top or y >= self.bottom:
+            return False
+        row0 = max(0, math.floor((y - self.top) / BLOCK))
+        row1 = min(ROWS - 1, math.ceil((y + h - self.top) / BLOCK) - 1)
+        if row0 > row1:
+            return False
+        for i, left in enumerate(self.lefts):
+            col0 = max(0, math.floor((x - left) / BLOCK))
+            col1 = min(COLS - 1, math.ceil((x + w - left) / BLOCK) - 1)
+            if col0 > col1 or not self.blocks[i]:
+                continue
+            first = None
+            rows = range(row0, row1 + 1)
+            if upward:
+                rows = reversed(rows)
+            for row in rows:
+                for col in range(col0, col1 + 1):
+                    cell = (i * ROWS + row) * COLS + col
+                    if self.alive[cell] and (first is None or self.order[cell] < self.order[first]):
+                        first = cell
+                if first is not None and upward is not None:
+                    break
+            if first is not None:
+                self.alive[first] = False
+                self.blocks[i] -= 1
+                return True
+        return False
+
+    def regen(self, threshold=15):
+        # Each damaged base gets its first missing block (row-major) back
+        for i in range(self.count):
+            if self.blocks[i] >= threshold:
+                continue
+            start = i * ROWS * COLS
+            for cell in range(start, start + ROWS * COLS):
+                if self.valid[cell] and not self.alive[cell]:
+                    self.alive[cell] = True
+                    self.order[cell] = self.next_order
+                    self.next_order += 1
+                    self.blocks[i] += 1
+                    break
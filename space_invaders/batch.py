@@ -0,0 +1,306 @@
+# Batched Space Invaders: N games advanced in lockstep with NumPy.
+# Covers the core rules (player, bullets, invaders, alien bullets, bases and
+# score) and matches game.step() on GameState(..., specials=False) for the
+# same seeds and inputs. Each game draws from its own random.Random stream in
+# the same order as the single-game rules, so only the dice rolls stay scalar.
+import random
+import numpy as np
+from game import (WIDTH, HEIGHT, player_speed, bullet_speed, alien_bullet_speed, invader_speed,
+                  invader_speedup, wave_interval, base_regen_interval, invader_fire_gap, invader_fire_gap_step,
+                  invader_fire_haste, invader_fire_gap_min)
+from units import TICK_RATE, per_tick, ticks
+from bases import Bases
+
+# Base block layout shared with the single-game bitmap, one column per cell
+BASE_LAYOUT = Bases(HEIGHT - 150)
+BASE_CELL_X = np.array(BASE_LAYOUT.cell_x, dtype=float)
+BASE_CELL_Y = np.array(BASE_LAYOUT.cell_y, dtype=float)
+BASE_CELL_VALID = np.array(BASE_LAYOUT.valid)
+BASE_CELLS = len(BASE_CELL_VALID) // BASE_LAYOUT.count
+BASE_TOP = BASE_LAYOUT.top
+BASE_BOTTOM = BASE_CELL_Y.max() + 8
+NO_HIT = np.iinfo(np.int64).max
+
+
+class Slots:
+    # Per-game ordered entities: positions plus an alive mask. New entries go
+    # after the last used slot and compact() squeezes out dead ones in order.
+    def __init__(self, n, capacity):
+        self.x = np.zeros((n, capacity))
+        self.y = np.zeros((n, capacity))
+        self.alive = np.zeros((n, capacity), dtype=bool)
+        self.count = np.zeros(n, dtype=np.int64)
+
+    def reserve(self, needed):
+        capacity = self.x.shape[1]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        pad = ((0, 0), (0, capacity - self.x.shape[1]))
+        self.x = np.pad(self.x, pad)
+        self.y = np.pad(self.y, pad)
+        self.alive = np.pad(self.alive, pad)
+
+    def append(self, games, x, y):
+        if len(games) == 0:
+            return
+        slots = self.count[games]
+        self.reserve(int(slots.max()) + 1)
+        self.x[games, slots] = x
+        self.y[games, slots] = y
+        self.alive[games, slots] = True
+        self.count[games] = slots + 1
+
+    def clear(self, games):
+        self.alive[games] = False
+        self.count[games] = 0
+
+    def compact(self):
+        order = np.argsort(~self.alive, axis=1, kind="stable")
+        self.x = np.take_along_axis(self.x, order, axis=1)
+        self.y = np.take_along_axis(self.y, order, axis=1)
+        self.alive = np.take_along_axis(self.alive, order, axis=1)
+        self.count = self.alive.sum(axis=1)
+
+    def alive_count(self):
+        return self.alive.sum(axis=1)
+
+
+class BatchGame:
+    def __init__(self, n, difficulty=1, seeds=None):
+        self.n = n
+        self.difficulty = np.broadcast_to(np.asarray(difficulty, dtype=np.int64), (n,)).copy()
+        if seeds is None:
+            seeds = [None] * n
+        self.rngs = [random.Random(seed) for seed in seeds]
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+
+        # Player
+        self.player_x = np.full(n, WIDTH // 2, dtype=np.float64)
+        self.player_y = HEIGHT - 50
+
+        # Bullets
+        self.bullets = Slots(n, 16)
+        self.alien_bullets = Slots(n, 16)
+
+        # Bases: occupancy per cell plus a build-order stamp, so the block a
+        # projectile removes is the one that would come first in the list
+        self.base_alive = np.tile(BASE_CELL_VALID, (n, 1))
+        self.base_order = np.tile(np.array([-1 if o is None else o for o in BASE_LAYOUT.order]), (n, 1))
+        self.base_next = np.full(n, BASE_LAYOUT.next_order, dtype=np.int64)
+
+        # Invaders
+        self.invaders = Slots(n, 64)
+        for row in range(5):
+            self._add_invader_row(np.arange(n), row * 40 + 50)
+        self.invader_direction = np.ones(n, dtype=np.int64)
+
+        # Wave system
+        self.wave_spawn_timer = np.zeros(n, dtype=np.int64)
+        self.base_regen_timer = np.zeros(n, dtype=np.int64)
+
+    def reset_games(self, games, seeds=None, difficulty=None):
+        # Start the given games over (as a fresh BatchGame would) while the
+        # rest carry on; seeds has one entry per game
+        games = np.asarray(games, dtype=np.int64)
+        if len(games) == 0:
+            return
+        if seeds is None:
+            seeds = [None] * len(games)
+        for g, seed in zip(games.tolist(), seeds):
+            self.rngs[g] = random.Random(seed)
+        if difficulty is not None:
+            self.difficulty[games] = difficulty
+        self.frame[games] = 0
+        self.game_over[games] = False
+        self.score[games] = 0
+        self.player_x[games] = WIDTH // 2
+        self.bullets.clear(games)
+        self.alien_bullets.clear(games)
+        self.base_alive[games] = BASE_CELL_VALID
+        self.base_order[games] = [-1 if o is None else o for o in BASE_LAYOUT.order]
+        self.base_next[games] = BASE_LAYOUT.next_order
+        self.invaders.clear(games)
+        for row in range(5):
+            self._add_invader_row(games, row * 40 + 50)
+        self.invader_direction[games] = 1
+        self.wave_spawn_timer[games] = 0
+        self.base_regen_timer[games] = 0
+
+    def _add_invader_row(self, games, y):
+        for col in range(10):
+            self.invaders.append(games, col * 60 + 100, y)
+
+    def step(self, left, right, fire):
+        # left/right are per-game booleans, fire is the per-game shot count
+        live = ~self.game_over
+        left = np.asarray(left, dtype=bool) & live
+        right = np.asarray(right, dtype=bool) & live
+        fire = np.where(live, np.asarray(fire, dtype=np.int64), 0)
+
+        # Fire from the position before this frame's movement
+        for shot in range(int(fire.max(initial=0))):
+            games = np.flatnonzero(fire > shot)
+            self.bullets.append(games, self.player_x[games] + 15, self.player_y)
+
+        # Player movement
+        self.player_x -= np.where(left & (self.player_x > 0), per_tick(player_speed), 0)
+        self.player_x += np.where(right & (self.player_x < WIDTH - 30), per_tick(player_speed), 0)
+
+        # Move bullets, dropping them once they leave the top
+        bullets = self.bullets
+        moving = bullets.alive & live[:, None]
+        bullets.y -= np.where(moving, per_tick(bullet_speed), 0)
+        bullets.alive &= ~(moving & (bullets.y < 0))
+
+        # Move alien bullets; the bottom check uses the position before moving
+        alien_bullets = self.alien_bullets
+        moving = alien_bullets.alive & live[:, None]
+        alien_bullets.alive &= ~(moving & (alien_bullets.y >= HEIGHT))
+        alien_bullets.y += np.where(moving, per_tick(alien_bullet_speed), 0)
+
+        self._invaders_shoot(live)
+        self._spawn_waves(live)
+        self._regen_bases(live)
+        self._move_invaders(live)
+        self._collide(live)
+
+        bullets.compact()
+        alien_bullets.compact()
+        self.invaders.compact()
+        self.frame += live
+
+    def _invaders_shoot(self, live):
+        # Aliens shoot based on difficulty and remaining count
+        invader_count = self.invaders.alive_count()
+        base_shoot_chance = ticks(invader_fire_gap) - self.difficulty * ticks(invader_fire_gap_step)
+        aggression_multiplier = np.maximum(1, (50 - invader_count) * invader_fire_haste * TICK_RATE)
+        shoot_chance = np.maximum(ticks(invader_fire_gap_min), base_shoot_chance - aggression_multiplier).astype(np.int64)
+        games = []
+        shooters = []
+        for g in np.flatnonzero(live).tolist():
+            rng = self.rngs[g]
+            if rng.randint(1, int(shoot_chance[g])) == 1 and invader_count[g]:
+                games.append(g)
+                shooters.append(rng.choice(range(int(invader_count[g]))))
+        if games:
+            invaders = self.invaders
+            self.alien_bullets.append(np.array(games), invaders.x[games, shooters] + 15, invaders.y[games, shooters] + 20)
+
+    def _spawn_waves(self, live):
+        # Spawn new invader waves
+        self.wave_spawn_timer += live
+        due = live & (self.wave_spawn_timer > ticks(wave_interval))
+        if due.any():
+            self._add_invader_row(np.flatnonzero(due), 50)
+            self.wave_spawn_timer[due] = 0
+
+    def _regen_bases(self, live):
+        # Every few seconds each damaged base gets its first missing block back
+        self.base_regen_timer += live
+        due = live & (self.base_regen_timer > ticks(base_regen_interval))
+        if not due.any():
+            return
+        for i in range(BASE_LAYOUT.count):
+            cells = slice(i * BASE_CELLS, (i + 1) * BASE_CELLS)
+            alive = self.base_alive[:, cells]
+            missing = BASE_CELL_VALID[cells] & ~alive
+            needs = due & (alive.sum(axis=1) < 15)
+            games = np.flatnonzero(needs)
+            if len(games) == 0:
+                continue
+            cell = i * BASE_CELLS + np.argmax(missing[games], axis=1)
+            self.base_alive[games, cell] = True
+            self.base_order[games, cell] = self.base_next[games]
+            self.base_next[games] += 1
+        self.base_regen_timer[due] = 0
+
+    def _move_invaders(self, live):
+        invaders = self.invaders
+        invader_count = invaders.alive_count()
+        base_speed = per_tick(invader_speed) * (0.5 + self.difficulty * 0.2)
+        current_speed = base_speed + (50 - invader_count) * per_tick(invader_speedup) * self.difficulty
+        moving = invaders.alive & live[:, None]
+        invaders.x += np.where(moving, (current_speed * self.invader_direction)[:, None], 0.0)
+
+        # Bounce off the sides, stepping up from the bottom band or down otherwise
+        edge = (moving & ((invaders.x <= 0) | (invaders.x >= WIDTH - 30))).any(axis=1)
+        bottom = (moving & (invaders.y >= HEIGHT - 100)).any(axis=1)
+        self.invader_direction[edge] *= -1
+        dy = np.where(edge, np.where(bottom, -10, 10), 0)
+        invaders.y += np.where(moving, dy[:, None], 0)
+
+    def _hit_bases(self, shots, live, width, height):
+        # Walk projectile slots in order; each removes at most one block, and
+        # only blocks still standing can be hit by later projectiles
+        for slot in range(int(shots.count.max(initial=0))):
+            # Cheap band test first: only shots level with the bases can hit
+            sy = shots.y[:, slot]
+            games = np.flatnonzero(shots.alive[:, slot] & live &
+                                   (sy < BASE_BOTTOM) & (sy + height > BASE_TOP))
+            if len(games) == 0:
+                continue
+            sx = shots.x[games, slot, None]
+            sy = sy[games, None]
+            overlap = (self.base_alive[games] &
+                       (sx < BASE_CELL_X + 8) & (sx + width > BASE_CELL_X) &
+                       (sy < BASE_CELL_Y + 8) & (sy + height > BASE_CELL_Y))
+            hit = overlap.any(axis=1)
+            games = games[hit]
+            if len(games) == 0:
+                continue
+            cell = np.argmin(np.where(overlap[hit], self.base_order[games], NO_HIT), axis=1)
+            self.base_alive[games, cell] = False
+            shots.alive[games, slot] = False
+
+    def _collide(self, live):
+        bullets = self.bullets
+        invaders = self.invaders
+        alien_bullets = self.alien_bullets
+        player_x = self.player_x[:, None]
+        player_y = self.player_y
+
+        # Bullets hit invaders: only the first bullet with a hit scores,
+        # taking out the first invader it overlaps
+        games = np.flatnonzero(live & (bullets.count > 0))
+        if len(games):
+            nb = int(bullets.count[games].max())
+            ni = int(invaders.count[games].max())
+            bx = bullets.x[games, :nb, None]
+            by = bullets.y[games, :nb, None]
+            ix = invaders.x[games, None, :ni]
+            iy = invaders.y[games, None, :ni]
+            overlap = (bullets.alive[games, :nb, None] & invaders.alive[games, None, :ni] &
+                       (bx < ix + 30) & (bx + 5 > ix) & (by < iy + 20) & (by + 10 > iy))
+            bullet_hit = overlap.any(axis=2)
+            hit = bullet_hit.any(axis=1)
+            games = games[hit]
+            if len(games):
+                bullet = np.argmax(bullet_hit[hit], axis=1)
+                invader = np.argmax(overlap[hit][np.arange(len(games)), bullet], axis=1)
+                bullets.alive[games, bullet] = False
+                invaders.alive[games, invader] = False
+                self.score[games] += 10
+
+        # Bullets and alien bullets hit bases
+        self._hit_bases(bullets, live, 5, 10)
+        self._hit_bases(alien_bullets, live, 5, 10)
+
+        # Alien bullets hit player
+        ax = alien_bullets.x
+        ay = alien_bullets.y
+        shot = (alien_bullets.alive & (ax < player_x + 30) & (ax + 5 > player_x) &
+                (ay < player_y + 20) & (ay + 10 > player_y)).any(axis=1)
+
+        # Aliens hit player
+        ix = invaders.x
+        iy = invaders.y
+        rammed = (invaders.alive & (ix < player_x + 30) & (ix + 30 > player_x) &
+                  (iy < player_y + 20) & (iy + 20 > player_y)).any(axis=1)
+
+        # Win condition: the formation is gone
+        cleared = ~invaders.alive.any(axis=1)
+        self.game_over |= live & (shot | rammed | cleared)
@@ -0,0 +1,181 @@
+# Benchmark suite: drives the game loop through fixed stress scenarios with
+# the SDL dummy video driver and reports update and render times. Results can
+# be saved as a baseline; later runs fail if any scenario gets slower than the
+# baseline by more than --threshold.
+#
+#   python bench.py --save bench_baseline.json
+#   python bench.py --baseline bench_baseline.json
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from game import GameState, Inputs, step, WIDTH, HEIGHT, ticks, weapon_duration
+from bases import Bases
+from specials import BEHAVIOURS, TYPES
+from text_cache import TextCache
+from renderer import RENDERERS, load_images
+
+BULLETS = 200
+WAVES = 20
+
+
+# Each scenario is (setup, hold). setup builds the starting state; hold runs
+# untimed before every frame to keep the stress condition in place. The player
+# can't die, so every frame is simulated.
+def setup_formation(rng):
+    return GameState(difficulty=3, seed=1)
+
+
+def setup_waves(rng):
+    state = GameState(difficulty=3, seed=1)
+    for _ in range(WAVES):
+        state.invaders.add_row([col * 60 + 100 for col in range(10)], 50)
+    return state
+
+
+def setup_bullets(rng):
+    state = GameState(difficulty=3, seed=1)
+    state.current_weapon = "split"
+    return state
+
+
+def hold_bullets(state, rng):
+    state.weapon_timer = ticks(weapon_duration)
+    while len(state.bullets) < BULLETS:
+        state.bullets.spawn(rng.randrange(WIDTH - 5), rng.randrange(HEIGHT // 2, HEIGHT - 60), 0)
+
+
+def hold_specials(state, rng):
+    special_aliens = state.special_aliens
+    for kind in TYPES:
+        if not special_aliens.groups[kind].alive_count:
+            special_aliens.add(kind, *BEHAVIOURS[kind]["spawn"](rng))
+
+
+def hold_bases(state, rng):
+    if state.bases.alive != state.bases.valid:
+        state.bases = Bases(HEIGHT - 150)
+
+
+SCENARIOS = {
+    "formation": (setup_formation, None),
+    "waves": (setup_waves, None),
+    "bullets": (setup_bullets, hold_bullets),
+    "specials": (setup_formation, hold_specials),
+    "bases": (setup_formation, hold_bases),
+}
+
+
+def percentile(times, fraction):
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def summarize(times):
+    times = sorted(t * 1000 for t in times)
+    return {
+        "mean_ms": round(sum(times) / len(times), 4),
+        "p95_ms": round(percentile(times, 0.95), 4),
+        "p99_ms": round(percentile(times, 0.99), 4),
+    }
+
+
+def run_scenario(name, renderer, frames, warmup):
+    setup, hold = SCENARIOS[name]
+    rng = random.Random(name)
+    state = setup(rng)
+    inputs = Inputs()
+    update_times = []
+    render_times = []
+    clock = time.perf_counter
+    for frame in range(warmup + frames):
+        if hold:
+            hold(state, rng)
+        state.game_over = False
+        start = clock()
+        step(state, inputs)
+        middle = clock()
+        renderer.draw("playing", state)
+        end = clock()
+        pygame.event.pump()
+        if frame >= warmup:
+            update_times.append(middle - start)
+            render_times.append(end - middle)
+    return {"update": summarize(update_times), "render": summarize(render_times)}
+
+
+def best_of(runs):
+    # Per-statistic minimum over repeated runs, which filters out most
+    # interference from other processes
+    return {part: {stat: min(run[part][stat] for run in runs) for stat in runs[0][part]}
+            for part in runs[0]}
+
+
+def regressions(results, baseline, threshold, slack):
+    # (scenario, part, stat, baseline ms, current ms) for each slowdown. slack
+    # is an absolute allowance so sub-0.1 ms timings don't fail on noise.
+    found = []
+    for name, parts in results.items():
+        for part, stats in parts.items():
+            for stat in ("mean_ms", "p95_ms"):
+                before = baseline.get(name, {}).get(part, {}).get(stat)
+                if before and stats[stat] > before * (1 + threshold) + slack:
+                    found.append((name, part, stat, before, stats[stat]))
+    return found
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark Space Invaders update and render times")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="full")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames before timing starts")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per scenario; the best of each statistic is kept")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown of mean or p95 over the baseline (default 0.2 = 20%%)")
+    parser.add_argument("--slack", type=float, default=0.05, metavar="MS",
+                        help="extra absolute allowance in ms on top of the threshold (default 0.05)")
+    parser.add_argument("--save", metavar="PATH", help="write these results as a baseline")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = RENDERERS[args.renderer](screen, load_images(), TextCache(),
+                                        pygame.font.Font(None, 74), pygame.font.Font(None, 36))
+
+    results = {}
+    print(f"{'scenario':<12}{'part':<8}{'mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in args.scenarios:
+        results[name] = best_of([run_scenario(name, renderer, args.frames, args.warmup)
+                                 for _ in range(args.repeats)])
+        for part, stats in results[name].items():
+            print(f"{name:<12}{part:<8}{stats['mean_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+    pygame.quit()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.threshold, args.slack)
+        for name, part, stat, before, after in found:
+            print(f"REGRESSION: {name} {part} {stat} {before:.3f} -> {after:.3f} ms")
+        if found:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
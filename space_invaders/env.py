@@ -0,0 +1,245 @@
+# Gym-style environments over the headless rules, for training agents without
+# a window. Observations are fixed-shape NumPy arrays read straight from the
+# game state.
+#
+# InvadersEnv runs one game with the full rules (special aliens, mini-aliens,
+# the UFO and weapon drops, swept collisions) at a few thousand steps per
+# second; an optional low-resolution pixel view is drawn off-screen only when
+# it is created with pixels=(width, height).
+#
+#   env = InvadersEnv(difficulty=3)
+#   obs, info = env.reset(seed=0)
+#   obs, reward, terminated, truncated, info = env.step(3)  # fire
+#
+# BatchInvadersEnv runs num_envs games in lockstep on BatchGame, which covers
+# the core rules only (player, bullets, invaders, alien bullets, bases), and
+# steps them all with array ops; use it for throughput.
+#
+#   envs = BatchInvadersEnv(256, difficulty=3)
+#   obs, info = envs.reset(seed=0)
+#   obs, reward, terminated, truncated, info = envs.step(actions)  # one per game
+import random
+from itertools import islice
+import numpy as np
+from game import GameState, Inputs, step, WIDTH, HEIGHT, TICK_RATE
+from batch import BatchGame
+from specials import TYPES
+
+# Discrete actions as (left, right, fire)
+ACTIONS = [
+    (False, False, 0),  # 0 noop
+    (True, False, 0),   # 1 left
+    (False, True, 0),   # 2 right
+    (False, False, 1),  # 3 fire
+    (True, False, 1),   # 4 left + fire
+    (False, True, 1),   # 5 right + fire
+]
+WEAPONS = ["normal", "split", "laser", "super"]
+
+# Rows per entity array. Each row is x, y, then per-kind fields, and a final
+# 1 for a present entity; unused rows are all zero. Past these limits the
+# extra entities are left out.
+MAX_INVADERS = 200
+MAX_BULLETS = 64
+MAX_ALIEN_BULLETS = 64
+MAX_SPECIALS = 16
+MAX_MINIS = 10
+MAX_DROPS = 8
+
+
+class InvadersEnv:
+    def __init__(self, difficulty=1, specials=True, swept=False, frame_skip=1,
+                 max_steps=60 * TICK_RATE * 10, pixels=None):
+        self.difficulty = difficulty
+        self.specials = specials
+        self.swept = swept
+        self.frame_skip = frame_skip  # ticks per step; fire only on the first
+        self.max_steps = max_steps
+        self.pixels = pixels          # (width, height) to add a "pixels" view
+        self.action_count = len(ACTIONS)
+        self.state = None
+        self.steps = 0
+        self.canvas = None
+
+    def reset(self, seed=None, difficulty=None):
+        if difficulty is not None:
+            self.difficulty = difficulty
+        self.state = GameState(difficulty=self.difficulty, seed=seed, specials=self.specials, swept=self.swept)
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def step(self, action):
+        state = self.state
+        left, right, fire = ACTIONS[action]
+        score = state.score
+        for tick in range(self.frame_skip):
+            step(state, Inputs(left, right, fire if tick == 0 else 0))
+            if state.game_over:
+                break
+        self.steps += 1
+        reward = state.score - score
+        truncated = not state.game_over and self.steps >= self.max_steps
+        return self.observe(), reward, state.game_over, truncated, self.info()
+
+    def info(self):
+        state = self.state
+        return {"score": state.score, "frame": state.frame, "won": state.won, "seed": state.seed}
+
+    def observe(self):
+        state = self.state
+        obs = {
+            # x, y, weapon index, weapon seconds left
+            "player": np.array([state.player_x, state.player_y, WEAPONS.index(state.current_weapon),
+                                state.weapon_timer / TICK_RATE], dtype=np.float32),
+            "invaders": np.zeros((MAX_INVADERS, 3), dtype=np.float32),
+            "bullets": rows(state.bullets, MAX_BULLETS),
+            "alien_bullets": rows(state.alien_bullets, MAX_ALIEN_BULLETS),
+            # One flag per base block cell, in Bases cell order
+            "bases": np.array(state.bases.alive, dtype=np.float32),
+            # x, y, type index (specials.TYPES), hit points left, alive flag
+            "specials": np.zeros((MAX_SPECIALS, 5), dtype=np.float32),
+            "minis": rows(state.mini_aliens, MAX_MINIS),
+            # x, y, weapon index, 1 if present
+            "drops": np.zeros((MAX_DROPS, 4), dtype=np.float32),
+            "ufo": np.zeros(3, dtype=np.float32),
+        }
+
+        invaders = state.invaders
+        invaders.compact()
+        n = min(invaders.count, MAX_INVADERS)
+        table = obs["invaders"]
+        table[:n, 0] = invaders.x[:n]
+        table[:n, 1] = invaders.y[:n]
+        table[:n, 2] = 1
+
+        table = obs["specials"]
+        i = 0
+        for group in state.special_aliens.groups.values():
+            n = min(group.count, MAX_SPECIALS - i)
+            if n <= 0:
+                continue
+            table[i:i + n, 0] = group.x[:n]
+            table[i:i + n, 1] = group.y[:n]
+            table[i:i + n, 2] = TYPES.index(group.kind)
+            table[i:i + n, 3] = group.hp[:n]
+            table[i:i + n, 4] = group.alive[:n]
+            i += n
+
+        table = obs["drops"]
+        for i, drop in enumerate(islice(state.weapon_drops, MAX_DROPS)):
+            table[i] = drop[0], drop[1], WEAPONS.index(drop[2]), 1
+
+        if state.ufo:
+            obs["ufo"][:] = state.ufo[0], state.ufo[1], 1
+
+        if self.pixels:
+            obs["pixels"] = self.render_pixels()
+        return obs
+
+    def render_pixels(self):
+        # Draw the frame off-screen at full size and shrink it; returns a
+        # (height, width, 3) uint8 array
+        import pygame
+        from renderer import BLACK, draw_game
+        if self.canvas is None:
+            from atlas import pack
+            from text_cache import TextCache
+            pygame.font.init()
+            atlas, rects = pack()
+            self.images = {name: atlas.subsurface(rect) for name, rect in rects.items()}
+            self.text = TextCache()
+            self.font = pygame.font.Font(None, 36)
+            self.canvas = pygame.Surface((WIDTH, HEIGHT))
+            self.small = pygame.Surface(self.pixels)
+        self.canvas.fill(BLACK)
+        draw_game(self.canvas, self.state, self.images, self.text, self.font)
+        pygame.transform.smoothscale(self.canvas, self.pixels, self.small)
+        return pygame.surfarray.array3d(self.small).transpose(1, 0, 2)
+
+
+class BatchInvadersEnv:
+    # Vectorized over num_envs games: actions, rewards and flags are arrays
+    # with one entry per game, and each observation array gets a leading
+    # num_envs axis. A game that terminates or is truncated is reset in the
+    # same step: the observation returned for it is the new game's first, and
+    # info["final_score"] holds the score it ended on (-1 for games that
+    # carry on).
+    def __init__(self, num_envs, difficulty=1, frame_skip=1, max_steps=60 * TICK_RATE * 10):
+        self.num_envs = num_envs
+        self.difficulty = difficulty  # one level, or one per game
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.action_count = len(ACTIONS)
+        self.actions = np.array(ACTIONS, dtype=np.int64)  # action -> left, right, fire
+        self.games = None
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.rng = random.Random()  # seeds for games started by auto-reset
+
+    def reset(self, seed=None):
+        # Game i of the first batch uses seed + i; later games draw their
+        # seeds from a stream seeded by seed
+        self.rng = random.Random(seed)
+        seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        self.games = BatchGame(self.num_envs, self.difficulty, seeds)
+        self.steps[:] = 0
+        return self.observe(), self.info()
+
+    def step(self, actions):
+        games = self.games
+        controls = self.actions[np.asarray(actions, dtype=np.int64)]
+        left = controls[:, 0].astype(bool)
+        right = controls[:, 1].astype(bool)
+        score = games.score.copy()
+        for tick in range(self.frame_skip):
+            games.step(left, right, controls[:, 2] if tick == 0 else 0)
+        self.steps += 1
+        reward = games.score - score
+        terminated = games.game_over.copy()
+        truncated = ~terminated & (self.steps >= self.max_steps)
+        info = self.info()
+        done = np.flatnonzero(terminated | truncated)
+        info["final_score"] = np.full(self.num_envs, -1, dtype=np.int64)
+        if len(done):
+            info["final_score"][done] = games.score[done]
+            games.reset_games(done, [self.rng.randrange(2 ** 32) for _ in done])
+            self.steps[done] = 0
+        return self.observe(), reward, terminated, truncated, info
+
+    def info(self):
+        games = self.games
+        return {"score": games.score.copy(), "frame": games.frame.copy()}
+
+    def observe(self):
+        # Same layout as InvadersEnv for the parts BatchGame simulates
+        games = self.games
+        n = self.num_envs
+        player = np.zeros((n, 4), dtype=np.float32)  # x, y, weapon index, weapon seconds left
+        player[:, 0] = games.player_x
+        player[:, 1] = games.player_y
+        return {
+            "player": player,
+            "invaders": slots(games.invaders, MAX_INVADERS),
+            "bullets": slots(games.bullets, MAX_BULLETS),
+            "alien_bullets": slots(games.alien_bullets, MAX_ALIEN_BULLETS),
+            "bases": games.base_alive.astype(np.float32),
+        }
+
+
+def slots(entities, limit):
+    # x, y, alive for the first `limit` slots of every game in a batch.Slots
+    k = min(limit, entities.x.shape[1])
+    table = np.zeros((len(entities.x), limit, 3), dtype=np.float32)
+    alive = entities.alive[:, :k]
+    table[:, :k, 0] = np.where(alive, entities.x[:, :k], 0)
+    table[:, :k, 1] = np.where(alive, entities.y[:, :k], 0)
+    table[:, :k, 2] = alive
+    return table
+
+
+def rows(records, limit):
+    # x, y, 1 for the first `limit` records of a pool or list
+    table = np.zeros((limit, 3), dtype=np.float32)
+    data = [(record[0], record[1], 1) for record in islice(records, limit)]
+    if data:
+        table[:len(data)] = data
+    return table
@@ -0,0 +1,100 @@
+# Struct-of-arrays store for the invader formation.
+# Positions live in contiguous NumPy arrays so movement, edge detection and
+# the bounce are a handful of vectorized ops instead of per-invader loops.
+import numpy as np
+
+
+class InvaderFormation:
+    def __init__(self, capacity=64):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0        # slots in use, dead or alive
+        self.alive_count = 0
+        self.dx = 0.0         # how far the last update() moved everyone
+        self.dy = 0
+
+    def __len__(self):
+        return self.alive_count
+
+    def __bool__(self):
+        return self.alive_count > 0
+
+    def _grow(self, needed):
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("x", "y", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def compact(self):
+        # Drop dead slots while keeping survivors in their original order
+        if self.count == self.alive_count:
+            return
+        n = self.count
+        keep = self.alive[:n]
+        m = self.alive_count
+        self.x[:m] = self.x[:n][keep]
+        self.y[:m] = self.y[:n][keep]
+        self.alive[:m] = True
+        self.alive[m:n] = False
+        self.count = m
+
+    def add_row(self, xs, y):
+        self.compact()
+        n = self.count
+        m = n + len(xs)
+        if m > len(self.x):
+            self._grow(m)
+        self.x[n:m] = xs
+        self.y[n:m] = y
+        self.alive[n:m] = True
+        self.count = m
+        self.alive_count += len(xs)
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.alive_count -= 1
+
+    def indices(self):
+        self.compact()
+        return range(self.count)
+
+    def positions(self, alpha=1.0):
+        # alpha < 1 gives positions that far between the last update and now
+        self.compact()
+        n = self.count
+        if alpha < 1:
+            lag = 1 - alpha
+            return zip((self.x[:n] - self.dx * lag).tolist(), (self.y[:n] - self.dy * lag).tolist())
+        return zip(self.x[:n].tolist(), self.y[:n].tolist())
+
+    def update(self, speed, direction, width, height):
+        # Slide sideways; on touching an edge flip direction and step vertically,
+        # bouncing between the bottom and top bands. Returns the new direction.
+        self.compact()
+        n = self.count
+        self.dx = 0.0
+        self.dy = 0
+        if n == 0:
+            return direction
+        x = self.x[:n]
+        y = self.y[:n]
+        self.dx = speed * direction
+        x += self.dx
+        if (x <= 0).any() or (x >= width - 30).any():
+            direction *= -1
+            self.dy = -10 if (y >= height - 100).any() else 10
+            y += self.dy
+        return direction
+
+    def overlaps(self, x, y, w, h):
+        self.compact()
+        n = self.count
+        ix = self.x[:n]
+        iy = self.y[:n]
+        return bool(((ix < x + w) & (ix + 30 > x) & (iy < y + h) & (iy + 20 > y)).any())
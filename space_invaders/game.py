@@ -0,0 +1,517 @@
+# Headless Space Invaders simulation.
+# GameState holds everything the rules need and step() advances it by one
+# fixed tick (see units.py). Nothing here touches pygame, so the game can be
+# driven as fast as the CPU allows for soak tests and tooling.
+import random
+from spatial_hash import SpatialHash
+from formation import InvaderFormation
+from bases import Bases
+from pool import Pool
+from specials import SpecialAliens
+from units import TICK_RATE, DT, per_tick, ticks
+
+WIDTH, HEIGHT = 800, 600
+
+# Speeds in pixels per second
+player_speed = 300
+bullet_speed = 420
+alien_bullet_speed = 180
+invader_speed = 60
+invader_speedup = 3  # per missing invader, times difficulty
+drop_speed = 240
+mini_speed = 180
+ufo_speed = 120
+
+# Intervals in seconds
+special_interval = 15
+wave_interval = 20
+base_regen_interval = 5
+weapon_duration = 30
+
+# Invader fire: each tick one random invader shoots with a 1-in-N chance,
+# where N is the mean gap between shots in ticks. The gap starts at
+# invader_fire_gap, shrinks with difficulty and with every missing invader
+# (by at least one tick), and never drops below invader_fire_gap_min
+invader_fire_gap = 10 / 3
+invader_fire_gap_step = 0.5     # per difficulty level
+invader_fire_haste = 1 / 120    # per missing invader
+invader_fire_gap_min = 1 / 3
+
+
+class Inputs:
+    def __init__(self, left=False, right=False, fire=0):
+        self.left = left
+        self.right = right
+        self.fire = fire  # number of shots requested this tick
+
+
+class GameState:
+    def __init__(self, difficulty=1, seed=None, specials=True, swept=False):
+        self.difficulty = difficulty
+        self.specials = specials  # special aliens, the UFO and its weapon drops
+        # Test the path each projectile covered this tick instead of only its
+        # end position, so fast projectiles can't tunnel through targets
+        self.swept = swept
+        # All randomness comes from this stream, so a seed plus the per-tick
+        # inputs reproduces a game exactly
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.frame = 0
+        self.game_over = False
+
+        # Player (prev_player_x is where the last tick started, for drawing
+        # in between ticks)
+        self.player_x = WIDTH // 2
+        self.prev_player_x = self.player_x
+        self.player_y = HEIGHT - 50
+
+        # Bullets: x, y, pixels travelled this tick
+        self.bullets = Pool(256, 3)
+        self.alien_bullets = Pool(256, 3)
+
+        # Bases
+        self.bases = Bases(HEIGHT - 150)
+
+        # Invaders
+        self.invaders = InvaderFormation()
+        for row in range(5):
+            self.invaders.add_row([col * 60 + 100 for col in range(10)], row * 40 + 50)
+        self.invader_direction = 1
+
+        # Wave system
+        self.wave_spawn_timer = 0
+        self.base_regen_timer = 0
+
+        # Special aliens
+        self.special_aliens = SpecialAliens()
+        self.special_spawn_timer = 0
+        self.mini_aliens = []  # x, y, order of the spawner that dropped it
+
+        # Explosions
+        self.explosions = Pool(64, 3)
+
+        # UFO bonus ship
+        self.ufo = None
+        self.ufo_spawn_timer = 0
+
+        # Weapon system
+        self.weapon_drops = Pool(8, 3)
+        self.current_weapon = "normal"
+        self.weapon_timer = 0
+
+        # Score
+        self.score = 0
+
+        # Collision broad-phase grids (rebuilt every tick)
+        self.invader_grid = SpatialHash(WIDTH, HEIGHT)
+        self.special_grid = SpatialHash(WIDTH, HEIGHT)
+        self.mini_grid = SpatialHash(WIDTH, HEIGHT)
+
+    @property
+    def won(self):
+        return self.game_over and not self.invaders
+
+
+def fire(state, inputs):
+    player_x, player_y = state.player_x, state.player_y
+    for _ in range(inputs.fire):
+        if state.current_weapon == "normal":
+            state.bullets.spawn(player_x + 15, player_y, 0)
+        elif state.current_weapon == "split":
+            state.bullets.spawn(player_x + 15, player_y, 0)
+            state.bullets.spawn(player_x + 5, player_y, 0)
+            state.bullets.spawn(player_x + 25, player_y, 0)
+        elif state.current_weapon == "laser":
+            state.bullets.spawn(player_x + 15, player_y, 0)
+        elif state.current_weapon == "super":
+            state.bullets.spawn(player_x + 10, player_y, 0)  # Centered for bigger bullet
+
+
+def move_player(state, inputs):
+    state.prev_player_x = state.player_x
+    if inputs.left and state.player_x > 0:
+        state.player_x -= per_tick(player_speed)
+    if inputs.right and state.player_x < WIDTH - 30:
+        state.player_x += per_tick(player_speed)
+
+
+def move_projectiles(state):
+    # Move bullets
+    bullets = state.bullets
+    travel = per_tick(bullet_speed)
+    for bullet in bullets:
+        bullet[1] -= travel
+        bullet[2] = travel
+        if bullet[1] < 0:
+            bullets.release(bullet)
+    bullets.compact()
+
+    # Move weapon drops
+    weapon_drops = state.weapon_drops
+    for drop in weapon_drops:
+        drop[1] += per_tick(drop_speed)
+        if drop[1] > HEIGHT:
+            weapon_drops.release(drop)
+    weapon_drops.compact()
+
+    # Weapon timer countdown
+    if state.weapon_timer > 0:
+        state.weapon_timer -= 1
+        if state.weapon_timer == 0:
+            state.current_weapon = "normal"
+
+    # Move alien bullets, dropping the ones already past the bottom
+    alien_bullets = state.alien_bullets
+    travel = per_tick(alien_bullet_speed)
+    for alien_bullet in alien_bullets:
+        if alien_bullet[1] < HEIGHT:
+            alien_bullet[1] += travel
+            alien_bullet[2] = travel
+        else:
+            alien_bullets.release(alien_bullet)
+    alien_bullets.compact()
+
+
+def invaders_shoot(state):
+    # Aliens shoot based on difficulty and remaining count
+    invaders = state.invaders
+    base_shoot_chance = ticks(invader_fire_gap) - state.difficulty * ticks(invader_fire_gap_step)
+    aggression_multiplier = max(1, (50 - len(invaders)) * invader_fire_haste * TICK_RATE)
+    shoot_chance = max(ticks(invader_fire_gap_min), base_shoot_chance - aggression_multiplier)
+    if state.rng.randint(1, int(shoot_chance)) == 1 and invaders:
+        shooter = state.rng.choice(invaders.indices())
+        state.alien_bullets.spawn(float(invaders.x[shooter]) + 15, float(invaders.y[shooter]) + 20, 0)
+
+
+def spawn_specials(state):
+    state.special_spawn_timer += 1
+    if state.special_spawn_timer > ticks(special_interval):
+        state.special_aliens.spawn(state.rng)
+        state.special_spawn_timer = 0
+
+
+def update_ufo(state):
+    # UFO spawning and movement (more frequent on easier difficulties)
+    state.ufo_spawn_timer += 1
+    ufo_spawn_interval = 10 - (state.difficulty - 1) * 5 / 3  # Seconds: 10 on level 1 down to 3.3 on 5
+    if state.ufo_spawn_timer > ticks(ufo_spawn_interval) and not state.ufo:
+        state.ufo = [-50, 30]  # Start off-screen left
+        state.ufo_spawn_timer = 0
+
+    if state.ufo:
+        state.ufo[0] += per_tick(ufo_speed)  # Move right
+        if state.ufo[0] > WIDTH:  # Remove when off-screen
+            state.ufo = None
+
+
+def update_specials(state):
+    # Each type moves, shoots and spawns as one batch, driven by specials.BEHAVIOURS
+    state.special_aliens.update(state)
+
+
+def update_effects(state):
+    # Move explosions
+    explosions = state.explosions
+    for explosion in explosions:
+        explosion[2] -= 1  # Decrease timer
+        if explosion[2] <= 0:
+            explosions.release(explosion)
+    explosions.compact()
+
+    # Move mini aliens
+    mini_aliens = state.mini_aliens
+    for mini in mini_aliens[:]:
+        mini[1] += per_tick(mini_speed)
+        if mini[1] > HEIGHT:
+            mini_aliens.remove(mini)
+            state.special_aliens.child_gone(mini[2])
+
+
+def spawn_waves(state):
+    # Spawn new invader waves
+    state.wave_spawn_timer += 1
+    if state.wave_spawn_timer > ticks(wave_interval):
+        state.invaders.add_row([col * 60 + 100 for col in range(10)], 50)  # Add new row at top
+        state.wave_spawn_timer = 0
+
+
+def regen_bases(state):
+    # Regenerate bases over time
+    state.base_regen_timer += 1
+    if state.base_regen_timer > ticks(base_regen_interval):
+        # Put one block back on each base below 15 blocks (originally 20)
+        state.bases.regen(15)
+        state.base_regen_timer = 0
+
+
+def move_invaders(state):
+    # Move invaders (speed based on difficulty)
+    difficulty = state.difficulty
+    base_speed = per_tick(invader_speed) * (0.5 + difficulty * 0.2)  # Difficulty multiplier
+    current_speed = base_speed + (50 - len(state.invaders)) * per_tick(invader_speedup) * difficulty
+    # Bounce off the sides, stepping up from the bottom band or down otherwise
+    state.invader_direction = state.invaders.update(current_speed, state.invader_direction, WIDTH, HEIGHT)
+
+
+def collide(state, profiler=None):
+    invaders = state.invaders
+    bullets = state.bullets
+    alien_bullets = state.alien_bullets
+    special_aliens = state.special_aliens
+    mini_aliens = state.mini_aliens
+    bases = state.bases
+    explosions = state.explosions
+    player_x, player_y = state.player_x, state.player_y
+    invader_grid = state.invader_grid
+    special_grid = state.special_grid
+    mini_grid = state.mini_grid
+    # In swept mode each projectile's box is stretched back over the distance
+    # it travelled this tick, and when that covers several targets the one it
+    # reached first is hit
+    swept = state.swept
+
+    # Register collision targets in the broad-phase grids. Skipped when no
+    # bullets are in flight, since nothing would query them. The grids hand
+    # back indices: invader slots, and positions in aliens and minis.
+    invaders.compact()
+    invader_xs = invaders.x[:invaders.count].tolist()
+    invader_ys = invaders.y[:invaders.count].tolist()
+    aliens = special_aliens.handles() if bullets else []  # Spawn order
+    alien_xs = [float(group.x[i]) for group, i in aliens]
+    alien_ys = [float(group.y[i]) for group, i in aliens]
+    minis = list(mini_aliens) if bullets else []
+    if bullets:
+        invader_grid.build(invaders.x[:invaders.count], invaders.y[:invaders.count], 30, 20)
+        special_grid.build(alien_xs, alien_ys, 30, 20)
+        mini_grid.build([mini[0] for mini in minis], [mini[1] for mini in minis], 15, 10)
+    else:
+        invader_grid.clear()
+        special_grid.clear()
+        mini_grid.clear()
+
+    if profiler:
+        profiler.mark("broad phase")
+
+    # Collision detection - bullets hit invaders. Each of these passes is
+    # skipped outright when its grid is empty.
+    if invader_grid:
+        for bullet in bullets:
+            hit = False
+            bullet_width = 10 if state.current_weapon == "super" else 5
+            bullet_height = 10 + bullet[2] if swept else 10
+            candidates = invader_grid.query(bullet[0], bullet[1], bullet_width, bullet_height)
+            if swept and len(candidates) > 1:
+                candidates.sort(key=lambda invader: -invader_ys[invader])  # Lowest first
+            for invader in candidates:
+                invader_x = invader_xs[invader]
+                invader_y = invader_ys[invader]
+                if (bullet[0] < invader_x + 30 and bullet[0] + bullet_width > invader_x and
+                    bullet[1] < invader_y + 20 and bullet[1] + bullet_height > invader_y):
+                    explosions.spawn(invader_x, invader_y, ticks(0.5))  # x, y, ticks left
+                    if state.current_weapon == "laser":
+                        # Laser pierces through
+                        invaders.kill(invader)
+                        invader_grid.remove(invader)
+                        state.score += 10
+                    else:
+                        bullets.release(bullet)
+                        invaders.kill(invader)
+                        invader_grid.remove(invader)
+                        state.score += 10
+                        hit = True
+                        break
+            if hit:
+                break
+    bullets.compact()
+
+    if profiler:
+        profiler.mark("hit invaders")
+
+    # Collision detection - bullets hit special aliens
+    if special_grid:
+        for bullet in bullets:
+            hit = False
+            bullet_height = 10 + bullet[2] if swept else 10
+            candidates = special_grid.query(bullet[0], bullet[1], 5, bullet_height)
+            if swept and len(candidates) > 1:
+                candidates.sort(key=lambda alien: -alien_ys[alien])
+            for alien in candidates:
+                group, i = aliens[alien]
+                alien_x = alien_xs[alien]
+                alien_y = alien_ys[alien]
+                if (bullet[0] < alien_x + 30 and bullet[0] + 5 > alien_x and
+                    bullet[1] < alien_y + 20 and bullet[1] + bullet_height > alien_y):
+                    explosions.spawn(alien_x, alien_y, ticks(0.5))  # Add explosion
+                    # Shields take several hits; the table has the score for each
+                    state.score += special_aliens.hit(aliens[alien])
+                    if not group.alive[i]:
+                        special_grid.remove(alien)
+                    if state.current_weapon != "laser":
+                        bullets.release(bullet)
+                        hit = True
+                        break
+            if hit:
+                break
+    bullets.compact()
+    special_aliens.compact()
+
+    if profiler:
+        profiler.mark("hit specials")
+
+    # Collision detection - bullets hit mini aliens
+    if mini_grid:
+        for bullet in bullets:
+            bullet_height = 10 + bullet[2] if swept else 10
+            candidates = mini_grid.query(bullet[0], bullet[1], 5, bullet_height)
+            if swept and len(candidates) > 1:
+                candidates.sort(key=lambda k: -minis[k][1])
+            for k in candidates:
+                mini = minis[k]
+                if (bullet[0] < mini[0] + 15 and bullet[0] + 5 > mini[0] and
+                    bullet[1] < mini[1] + 10 and bullet[1] + bullet_height > mini[1]):
+                    explosions.spawn(mini[0], mini[1], ticks(1 / 3))  # Smaller explosion
+                    bullets.release(bullet)
+                    mini_aliens.remove(mini)
+                    mini_grid.remove(k)
+                    special_aliens.child_gone(mini[2])
+                    state.score += 5
+                    break
+    bullets.compact()
+
+    if profiler:
+        profiler.mark("hit minis")
+
+    # Collision detection - bullets hit UFO
+    ufo = state.ufo
+    if ufo:
+        for bullet in bullets:
+            bullet_height = 10 + bullet[2] if swept else 10
+            if (bullet[0] < ufo[0] + 40 and bullet[0] + 5 > ufo[0] and
+                bullet[1] < ufo[1] + 15 and bullet[1] + bullet_height > ufo[1]):
+                explosions.spawn(ufo[0], ufo[1], ticks(2 / 3))  # Bigger explosion for UFO
+                bullets.release(bullet)
+                state.score += 100
+                # Drop random weapon
+                weapons = ["split", "laser", "super"]
+                state.weapon_drops.spawn(ufo[0] + 20, ufo[1], state.rng.choice(weapons))
+                state.ufo = None
+                break
+        bullets.compact()
+
+    if profiler:
+        profiler.mark("hit ufo")
+
+    # Collision detection - player collects weapon drops
+    weapon_drops = state.weapon_drops
+    for drop in weapon_drops:
+        if (drop[0] < player_x + 30 and drop[0] + 20 > player_x and
+            drop[1] < player_y + 20 and drop[1] + 10 > player_y):
+            state.current_weapon = drop[2]
+            state.weapon_timer = ticks(weapon_duration)
+            weapon_drops.release(drop)
+    weapon_drops.compact()
+
+    if profiler:
+        profiler.mark("collect drops")
+
+    # Collision detection - bullets hit bases
+    for bullet in bullets:
+        if swept:
+            hit = bases.hit(bullet[0], bullet[1], 5, 10 + bullet[2], upward=True)
+        else:
+            hit = bases.hit(bullet[0], bullet[1], 5, 10)
+        if hit:
+            bullets.release(bullet)
+    bullets.compact()
+
+    if profiler:
+        profiler.mark("bullets vs bases")
+
+    # Collision detection - alien bullets hit bases
+    for alien_bullet in alien_bullets:
+        if swept:
+            hit = bases.hit(alien_bullet[0], alien_bullet[1] - alien_bullet[2], 5, 10 + alien_bullet[2], upward=False)
+        else:
+            hit = bases.hit(alien_bullet[0], alien_bullet[1], 5, 10)
+        if hit:
+            alien_bullets.release(alien_bullet)
+    alien_bullets.compact()
+
+    if profiler:
+        profiler.mark("alien bullets vs bases")
+
+    # Collision detection - alien bullets hit player
+    for alien_bullet in alien_bullets:
+        travel = alien_bullet[2] if swept else 0
+        if (alien_bullet[0] < player_x + 30 and alien_bullet[0] + 5 > player_x and
+            alien_bullet[1] - travel < player_y + 20 and alien_bullet[1] + 10 > player_y):
+            state.game_over = True
+
+    if profiler:
+        profiler.mark("alien bullets vs player")
+
+    # Collision detection - aliens hit player
+    if invaders.overlaps(player_x, player_y, 30, 20):
+        state.game_over = True
+
+    if profiler:
+        profiler.mark("invaders vs player")
+
+    # Collision detection - special aliens hit player
+    if special_aliens.overlaps(player_x, player_y, 30, 20):
+        state.game_over = True
+
+    if profiler:
+        profiler.mark("specials vs player")
+
+    # Collision detection - mini aliens hit player
+    for mini in mini_aliens:
+        if (mini[0] < player_x + 30 and mini[0] + 15 > player_x and
+            mini[1] < player_y + 20 and mini[1] + 10 > player_y):
+            state.game_over = True
+
+    if profiler:
+        profiler.mark("minis vs player")
+
+    # Check win condition
+    if not invaders and not special_aliens:
+        state.game_over = True
+    if profiler:
+        profiler.mark("win check")
+
+
+# Update phases after the player's own input, in order, with the names the
+# profiler reports them under
+PHASES = [
+    ("projectiles", move_projectiles),
+    ("invader fire", invaders_shoot),
+    ("special spawn", spawn_specials),
+    ("ufo", update_ufo),
+    ("special ai", update_specials),
+    ("effects", update_effects),
+    ("waves", spawn_waves),
+    ("base regen", regen_bases),
+    ("invaders", move_invaders),
+]
+SPECIAL_PHASES = (spawn_specials, update_ufo, update_specials)
+
+
+def step(state, inputs, profiler=None):
+    # profiler is optional; when given, profiler.mark(name) is called as each
+    # phase finishes so it can attribute the elapsed time
+    if state.game_over:
+        return state
+    fire(state, inputs)
+    move_player(state, inputs)
+    if profiler:
+        profiler.mark("player")
+    for name, phase in PHASES:
+        if state.specials or phase not in SPECIAL_PHASES:
+            phase(state)
+            if profiler:
+                profiler.mark(name)
+    collide(state, profiler)
+    state.frame += 1
+    return state
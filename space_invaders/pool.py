@@ -0,0 +1,40 @@
+# Object pool for short-lived records (bullets, explosions, drops).
+# Records are plain lists reused through a free list. Releasing only queues a
+# record; compact() then drops every queued record in one O(n) pass, keeping
+# the survivors in spawn order.
+
+
+class Pool:
+    def __init__(self, capacity, fields):
+        self.items = []
+        self.free = [[0] * fields for _ in range(capacity)]
+        self.pending = []
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def spawn(self, *values):
+        if self.free:
+            item = self.free.pop()
+            item[:] = values
+        else:
+            item = list(values)  # over capacity: grow rather than drop
+        self.items.append(item)
+        return item
+
+    def release(self, item):
+        self.pending.append(item)
+
+    def compact(self):
+        if not self.pending:
+            return
+        released = {id(item) for item in self.pending}
+        self.items[:] = [item for item in self.items if id(item) not in released]
+        self.free.extend(self.pending)
+        self.pending.clear()
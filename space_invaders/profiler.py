@@ -0,0 +1,82 @@
+# Opt-in per-phase frame timing. The game loop calls begin_frame(), then
+# mark(name) as each named phase finishes; the time since the previous mark
+# is charged to that phase. Keeps every frame for export and draws a rolling
+# breakdown as an overlay.
+import csv
+import json
+import time
+import pygame
+from units import TICK_RATE
+
+BUDGET_MS = 1000 / TICK_RATE  # one simulation tick
+
+
+class FrameProfiler:
+    def __init__(self, window=60, refresh=30):
+        self.window = window      # frames averaged by the overlay
+        self.refresh = refresh    # frames between overlay redraws
+        self.phases = []          # phase names in first-seen order
+        self.frames = []          # one {phase: ms} dict per frame
+        self.current = None
+        self.last = 0.0
+        self.overlay = None
+        self.overlay_age = refresh
+
+    def begin_frame(self):
+        self.current = {}
+        self.frames.append(self.current)
+        self.last = time.perf_counter()
+
+    def mark(self, name):
+        now = time.perf_counter()
+        if name not in self.current:
+            if name not in self.phases:
+                self.phases.append(name)
+            self.current[name] = 0.0
+        self.current[name] += (now - self.last) * 1000
+        self.last = now
+
+    def averages(self):
+        recent = self.frames[-self.window:]
+        if not recent:
+            return {}
+        return {name: sum(frame.get(name, 0.0) for frame in recent) / len(recent) for name in self.phases}
+
+    def draw(self, surface, font):
+        # Text is re-rendered every `refresh` frames; in between the cached
+        # overlay is blitted as-is. Returns the rectangle drawn.
+        self.overlay_age += 1
+        if self.overlay is None or self.overlay_age >= self.refresh:
+            self.overlay = self.render(font)
+            self.overlay_age = 0
+        return surface.blit(self.overlay, (surface.get_width() - self.overlay.get_width() - 10, 10))
+
+    def render(self, font):
+        averages = self.averages()
+        rows = [("frame", sum(averages.values()), (255, 255, 255))]
+        for name, ms in sorted(averages.items(), key=lambda item: -item[1]):
+            rows.append((name, ms, (255, 80, 80) if ms > BUDGET_MS / 4 else (200, 200, 200)))
+        labels = [font.render(f"{name:<24}{ms:7.3f} ms", True, color) for name, ms, color in rows]
+        line_height = font.get_linesize()
+        width = max(label.get_width() for label in labels) + 74
+        overlay = pygame.Surface((width, line_height * len(rows) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, (label, (_, ms, color)) in enumerate(zip(labels, rows)):
+            y = 4 + i * line_height
+            overlay.blit(label, (4, y))
+            # Bar scaled so its full 60 px width is the whole tick budget
+            overlay.fill(color, (width - 64, y + 3, max(1, min(60, int(60 * ms / BUDGET_MS))), line_height - 6))
+        return overlay
+
+    def export(self, path):
+        # One row per frame with a column per phase, as CSV or JSON by suffix
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"phases": self.phases,
+                           "frames": [[round(frame.get(name, 0.0), 4) for name in self.phases] for frame in self.frames]}, f)
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + self.phases)
+            for i, frame in enumerate(self.frames):
+                writer.writerow([i] + [round(frame.get(name, 0.0), 4) for name in self.phases])
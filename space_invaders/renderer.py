@@ -0,0 +1,234 @@
+# Drawing for the Space Invaders window. FullRenderer clears and redraws the
+# whole frame; DirtyRenderer batches blits and only pushes changed rectangles.
+# Both take alpha, how far the display time is between the previous tick and
+# the current one, and draw everything that moves that far along its last move
+# (alpha=1 draws the current positions). Explosions and bases never move, so
+# they are drawn where they are.
+import pygame
+from game import WIDTH, HEIGHT, TICK_RATE, per_tick, ufo_speed, mini_speed, drop_speed
+from atlas import load_atlas
+
+# Colors
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+
+
+def load_images():
+    # Scaled sprites as views into one display-format atlas (see atlas.py)
+    return load_atlas()
+
+
+def draw_menu(screen, text, font, small_font):
+    title_text = text.render(font, "SPACE INVADERS", WHITE)
+    diff_text = text.render(small_font, "Select Difficulty (1-5):", WHITE)
+    diff1_text = text.render(small_font, "1 = Beginner", GREEN)
+    diff2_text = text.render(small_font, "2 = Rookie", (150, 255, 150))
+    diff3_text = text.render(small_font, "3 = Average", (255, 255, 150))
+    diff4_text = text.render(small_font, "4 = Hard", (255, 150, 150))
+    diff5_text = text.render(small_font, "5 = Nightmare", RED)
+
+    screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, HEIGHT//2 - 140))
+    screen.blit(diff_text, (WIDTH//2 - diff_text.get_width()//2, HEIGHT//2 - 60))
+    screen.blit(diff1_text, (WIDTH//2 - diff1_text.get_width()//2, HEIGHT//2 - 20))
+    screen.blit(diff2_text, (WIDTH//2 - diff2_text.get_width()//2, HEIGHT//2 + 10))
+    screen.blit(diff3_text, (WIDTH//2 - diff3_text.get_width()//2, HEIGHT//2 + 40))
+    screen.blit(diff4_text, (WIDTH//2 - diff4_text.get_width()//2, HEIGHT//2 + 70))
+    screen.blit(diff5_text, (WIDTH//2 - diff5_text.get_width()//2, HEIGHT//2 + 100))
+
+
+def draw_game_over(screen, state, text, font):
+    if state.won:
+        game_text = text.render(font, "YOU WIN!", WHITE)
+    else:
+        game_text = text.render(font, "GAME OVER!", RED)
+    quit_text = text.render(font, "Press Q to quit", WHITE)
+    screen.blit(game_text, (WIDTH//2 - game_text.get_width()//2, HEIGHT//2 - 50))
+    screen.blit(quit_text, (WIDTH//2 - quit_text.get_width()//2, HEIGHT//2 + 20))
+
+
+def draw_game(screen, state, images, text, small_font, alpha=1.0):
+    current_weapon = state.current_weapon
+    lag = 1 - alpha
+
+    # Draw score and weapon info
+    score_text = text.render(small_font, f"Score: {state.score}", WHITE)
+    screen.blit(score_text, (10, 10))
+
+    if current_weapon != "normal":
+        weapon_text = text.render(small_font, f"Weapon: {current_weapon.upper()} ({state.weapon_timer // TICK_RATE}s)", (0, 255, 0))
+        screen.blit(weapon_text, (10, 40))
+
+    player_x = state.player_x - (state.player_x - state.prev_player_x) * lag
+    screen.blit(images["player"], (player_x, state.player_y))
+
+    for bullet in state.bullets:
+        if current_weapon == "super":
+            pygame.draw.rect(screen, (255, 255, 0), (bullet[0], bullet[1] + bullet[2] * lag, 10, 20))  # Bigger yellow bullet
+        else:
+            color = (0, 255, 255) if current_weapon == "laser" else WHITE
+            pygame.draw.rect(screen, color, (bullet[0], bullet[1] + bullet[2] * lag, 5, 10))
+
+    for alien_bullet in state.alien_bullets:
+        pygame.draw.rect(screen, RED, (alien_bullet[0], alien_bullet[1] - alien_bullet[2] * lag, 5, 10))
+
+    for base in state.bases:
+        pygame.draw.rect(screen, WHITE, (base[0], base[1], 8, 8))
+
+    invader_img = images["invader"]
+    for invader_pos in state.invaders.positions(alpha):
+        screen.blit(invader_img, invader_pos)
+
+    # Draw special aliens
+    for kind, x, y in state.special_aliens.positions(alpha):
+        screen.blit(images[kind], (x, y))
+
+    # Draw mini aliens
+    mini_lag = per_tick(mini_speed) * lag
+    for mini in state.mini_aliens:
+        screen.blit(images["mini"], (mini[0], mini[1] - mini_lag))
+
+    # Draw explosions
+    for explosion in state.explosions:
+        screen.blit(images["exp"], (explosion[0], explosion[1]))
+
+    # Draw weapon drops
+    drop_lag = per_tick(drop_speed) * lag
+    for drop in state.weapon_drops:
+        color = (255, 255, 0) if drop[2] == "split" else (0, 255, 255) if drop[2] == "laser" else (255, 100, 0)
+        pygame.draw.rect(screen, color, (drop[0], drop[1] - drop_lag, 20, 10))
+
+    # Draw UFO
+    if state.ufo:
+        screen.blit(images["ufo"], (state.ufo[0] - per_tick(ufo_speed) * lag, state.ufo[1]))
+
+
+def draw_screen(screen, game_state, state, images, text, font, small_font, alpha=1.0):
+    screen.fill(BLACK)
+    if game_state == "menu":
+        draw_menu(screen, text, font, small_font)
+    elif game_state == "game_over":
+        draw_game_over(screen, state, text, font)
+    else:  # playing
+        draw_game(screen, state, images, text, small_font, alpha)
+
+
+class FullRenderer:
+    # Clear, redraw everything and flip the whole display every frame
+    def __init__(self, screen, images, text, font, small_font):
+        self.screen = screen
+        self.images = images
+        self.text = text
+        self.font = font
+        self.small_font = small_font
+
+    def draw(self, game_state, state, overlay=None, alpha=1.0):
+        # overlay, if given, is called with the screen after the frame is
+        # drawn and returns the rectangle it covered
+        draw_screen(self.screen, game_state, state, self.images, self.text, self.font, self.small_font, alpha)
+        if overlay:
+            overlay(self.screen)
+        pygame.display.flip()
+
+
+def solid(size, color):
+    surface = pygame.Surface(size).convert()
+    surface.fill(color)
+    return surface
+
+
+class DirtyRenderer(FullRenderer):
+    # Entities are grouped by image and drawn with one screen.blits() call.
+    # Last frame's rectangles are erased from a background copy and only the
+    # union of old and new rectangles is pushed to the display.
+    max_dirty_rects = 400  # past this a full flip is cheaper
+
+    def __init__(self, screen, images, text, font, small_font):
+        super().__init__(screen, images, text, font, small_font)
+        self.background = solid(screen.get_size(), BLACK)
+        self.bullet = {
+            "normal": solid((5, 10), WHITE),
+            "split": solid((5, 10), WHITE),
+            "laser": solid((5, 10), (0, 255, 255)),
+            "super": solid((10, 20), (255, 255, 0)),
+        }
+        self.alien_bullet = solid((5, 10), RED)
+        self.base = solid((8, 8), WHITE)
+        self.drops = {
+            "split": solid((20, 10), (255, 255, 0)),
+            "laser": solid((20, 10), (0, 255, 255)),
+            "super": solid((20, 10), (255, 100, 0)),
+        }
+        self.previous = []
+        self.shown = None
+
+    def draw(self, game_state, state, overlay=None, alpha=1.0):
+        if game_state != "playing":
+            # Menu and game-over screens are static: draw them once
+            if game_state != self.shown or overlay:
+                super().draw(game_state, state, overlay)
+                self.shown = game_state
+            self.previous = []
+            return
+        screen = self.screen
+        if self.shown != "playing":
+            screen.blit(self.background, (0, 0))
+            pygame.display.flip()
+            self.shown = "playing"
+
+        # Past the cap one full clear and flip beats erasing and pushing each
+        # rectangle; only a sparse frame is erased rect by rect
+        background = self.background
+        blits = self.batch(state, alpha)
+        full = len(self.previous) + len(blits) > self.max_dirty_rects
+        if full:
+            # Nothing to track: the next frame erases the whole screen
+            screen.blit(background, (0, 0))
+            screen.blits(blits, doreturn=False)
+            if overlay:
+                overlay(screen)
+            pygame.display.flip()
+            self.previous = [screen.get_rect()]
+            return
+        screen.blits([(background, rect, rect) for rect in self.previous], doreturn=False)
+        rects = screen.blits(blits)
+        if overlay:
+            rects.append(overlay(screen))
+        pygame.display.update(self.previous + rects)
+        self.previous = rects
+
+    def batch(self, state, alpha=1.0):
+        images = self.images
+        blits = []
+        add = blits.append
+        lag = 1 - alpha
+
+        # Score and weapon info
+        add((self.text.render(self.small_font, f"Score: {state.score}", WHITE), (10, 10)))
+        if state.current_weapon != "normal":
+            add((self.text.render(self.small_font, f"Weapon: {state.current_weapon.upper()} ({state.weapon_timer // TICK_RATE}s)", (0, 255, 0)), (10, 40)))
+
+        add((images["player"], (state.player_x - (state.player_x - state.prev_player_x) * lag, state.player_y)))
+        bullet = self.bullet[state.current_weapon]
+        blits.extend((bullet, (b[0], b[1] + b[2] * lag)) for b in state.bullets)
+        alien_bullet = self.alien_bullet
+        blits.extend((alien_bullet, (b[0], b[1] - b[2] * lag)) for b in state.alien_bullets)
+        base = self.base
+        blits.extend((base, position) for position in state.bases)
+        invader = images["invader"]
+        blits.extend((invader, position) for position in state.invaders.positions(alpha))
+        blits.extend((images[kind], (x, y)) for kind, x, y in state.special_aliens.positions(alpha))
+        mini = images["mini"]
+        mini_lag = per_tick(mini_speed) * lag
+        blits.extend((mini, (m[0], m[1] - mini_lag)) for m in state.mini_aliens)
+        explosion = images["exp"]
+        blits.extend((explosion, (e[0], e[1])) for e in state.explosions)
+        drop_lag = per_tick(drop_speed) * lag
+        blits.extend((self.drops[d[2]], (d[0], d[1] - drop_lag)) for d in state.weapon_drops)
+        if state.ufo:
+            add((images["ufo"], (state.ufo[0] - per_tick(ufo_speed) * lag, state.ufo[1])))
+        return blits
+
+
+RENDERERS = {"full": FullRenderer, "dirty": DirtyRenderer}
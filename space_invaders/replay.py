@@ -0,0 +1,121 @@
+# Deterministic input recording and headless replay.
+# A recording is the seed, difficulty and one input byte per frame, plus a
+# state hash every HASH_INTERVAL frames. Replaying re-runs the session at full
+# speed and checks each hash, so a session can be reproduced exactly.
+#
+#   python space_invaders.py --seed 1234 --record session.rec
+#   python replay.py session.rec
+import hashlib
+import struct
+import sys
+import time
+from game import GameState, Inputs, step
+
+MAGIC = b"SIREC3"
+HASH_INTERVAL = 60
+HEADER = struct.Struct("<6sQBBII")  # magic, seed, difficulty, flags, frames, hashes
+SPECIALS = 1  # flag bits
+SWEPT = 2
+CHECKPOINT = struct.Struct("<IQ")   # frame, hash
+SEED_LIMIT = 2 ** 64  # seeds are stored unsigned in the header
+
+
+def state_hash(state):
+    h = hashlib.blake2b(digest_size=8)
+    invaders = state.invaders
+    invaders.compact()
+    h.update(invaders.x[:invaders.count].tobytes())
+    h.update(invaders.y[:invaders.count].tobytes())
+    h.update(repr((
+        state.frame, state.player_x, state.score, state.game_over,
+        state.invader_direction, state.current_weapon, state.weapon_timer,
+        state.wave_spawn_timer, state.base_regen_timer, state.special_spawn_timer, state.ufo_spawn_timer,
+        state.ufo, state.bases.alive, [b[:2] for b in state.bullets], [b[:2] for b in state.alien_bullets],
+        state.special_aliens.snapshot(), state.mini_aliens, list(state.weapon_drops),
+    )).encode())
+    return struct.unpack("<Q", h.digest())[0]
+
+
+def pack_inputs(inputs):
+    return int(bool(inputs.left)) | int(bool(inputs.right)) << 1 | min(inputs.fire, 63) << 2
+
+
+def unpack_inputs(byte):
+    return Inputs(bool(byte & 1), bool(byte & 2), byte >> 2)
+
+
+def check_seed(seed):
+    # Raises ValueError for a seed the header can't hold
+    if not 0 <= seed < SEED_LIMIT:
+        raise ValueError(f"seed {seed} is out of range (0 to 2**64 - 1)")
+    return seed
+
+
+class Recorder:
+    def __init__(self, state):
+        # Checked here rather than in save(), so a bad seed fails before the
+        # session is played instead of losing it at exit
+        self.seed = check_seed(state.seed)
+        self.difficulty = state.difficulty
+        self.specials = state.specials
+        self.swept = state.swept
+        self.inputs = bytearray()
+        self.checkpoints = []
+
+    def record(self, state, inputs):
+        # Call after step(state, inputs)
+        self.inputs.append(pack_inputs(inputs))
+        if len(self.inputs) % HASH_INTERVAL == 0:
+            self.checkpoints.append((len(self.inputs), state_hash(state)))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            flags = (SPECIALS if self.specials else 0) | (SWEPT if self.swept else 0)
+            f.write(HEADER.pack(MAGIC, self.seed, self.difficulty, flags,
+                                len(self.inputs), len(self.checkpoints)))
+            f.write(self.inputs)
+            for checkpoint in self.checkpoints:
+                f.write(CHECKPOINT.pack(*checkpoint))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, seed, difficulty, flags, frames, hashes = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Space Invaders recording")
+    offset = HEADER.size
+    inputs = data[offset:offset + frames]
+    offset += frames
+    checkpoints = [CHECKPOINT.unpack_from(data, offset + i * CHECKPOINT.size) for i in range(hashes)]
+    return seed, difficulty, flags, inputs, checkpoints
+
+
+def replay(path):
+    # Re-run a recording headlessly; returns (final state, first bad frame or None)
+    seed, difficulty, flags, inputs, checkpoints = load(path)
+    expected = dict(checkpoints)
+    state = GameState(difficulty=difficulty, seed=seed, specials=bool(flags & SPECIALS), swept=bool(flags & SWEPT))
+    for frame, byte in enumerate(inputs, 1):
+        step(state, unpack_inputs(byte))
+        if frame in expected and state_hash(state) != expected[frame]:
+            return state, frame
+    return state, None
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("usage: python replay.py RECORDING")
+        sys.exit(2)
+    start = time.perf_counter()
+    state, bad_frame = replay(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    print(f"{state.frame} frames in {elapsed:.2f}s ({state.frame / max(elapsed, 1e-9):.0f} fps), score {state.score}")
+    if bad_frame is not None:
+        print(f"DESYNC: state hash mismatch at frame {bad_frame}")
+        sys.exit(1)
+    print("all state hashes match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Uniform-grid spatial hash for broad-phase collision checks.
+# build() registers one box per target, by index, in every cell the box
+# overlaps; queries return only the indices sharing a cell with the query box.
+# The bounding box of all targets is kept too, so a query that misses it (a
+# bullet above or below the formation) returns without touching any cell.
+import numpy as np
+
+BULK = 64  # from this many targets the cells are worked out with array ops
+
+
+class SpatialHash:
+    def __init__(self, width, height, cell_size=40):
+        self.cell_size = cell_size
+        self.cols = max(1, -(-width // cell_size))
+        self.rows = max(1, -(-height // cell_size))
+        self.cells = {}  # row * cols + col -> target indices, ascending
+        self.bounds = None  # left, top, right, bottom of every target
+        self.alive = bytearray()
+        self.live = 0
+
+    def __bool__(self):
+        return self.live > 0
+
+    def clear(self):
+        self.cells = {}
+        self.bounds = None
+        self.alive = bytearray()
+        self.live = 0
+
+    def _cell_range(self, x, y, w, h):
+        # Clamp to the playfield so off-screen objects fall into the edge cells
+        size = self.cell_size
+        last_col = self.cols - 1
+        last_row = self.rows - 1
+        x0 = int(x // size)
+        x1 = int((x + w) // size)
+        y0 = int(y // size)
+        y1 = int((y + h) // size)
+        x0 = 0 if x0 < 0 else last_col if x0 > last_col else x0
+        x1 = 0 if x1 < 0 else last_col if x1 > last_col else x1
+        y0 = 0 if y0 < 0 else last_row if y0 > last_row else y0
+        y1 = 0 if y1 < 0 else last_row if y1 > last_row else y1
+        return x0, x1, y0, y1
+
+    def build(self, xs, ys, w, h):
+        # Replace the targets with one w x h box per (xs[i], ys[i]); target i
+        # is index i in queries and remove()
+        n = len(xs)
+        self.clear()
+        if n == 0:
+            return
+        self.alive = bytearray(b"\x01") * n
+        self.live = n
+        if n < BULK:
+            xs = list(xs)
+            ys = list(ys)
+            self.bounds = [min(xs), min(ys), max(xs) + w, max(ys) + h]
+            cells = self.cells
+            cols = self.cols
+            for i in range(n):
+                x0, x1, y0, y1 = self._cell_range(xs[i], ys[i], w, h)
+                for cy in range(y0, y1 + 1):
+                    for cx in range(x0, x1 + 1):
+                        cell = cells.get(cy * cols + cx)
+                        if cell is None:
+                            cells[cy * cols + cx] = [i]
+                        else:
+                            cell.append(i)
+            return
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        self.bounds = [float(xs.min()), float(ys.min()), float(xs.max()) + w, float(ys.max()) + h]
+        # Every cell key of every box with array ops, then one sort groups the
+        # indices by cell (ascending within a cell)
+        size = self.cell_size
+        x0 = np.clip(xs // size, 0, self.cols - 1).astype(np.int64)
+        x1 = np.clip((xs + w) // size, 0, self.cols - 1).astype(np.int64)
+        y0 = np.clip(ys // size, 0, self.rows - 1).astype(np.int64)
+        y1 = np.clip((ys + h) // size, 0, self.rows - 1).astype(np.int64)
+        index = np.arange(n)
+        keys = []
+        indices = []
+        for dy in range(int((y1 - y0).max()) + 1):
+            for dx in range(int((x1 - x0).max()) + 1):
+                covered = (x0 + dx <= x1) & (y0 + dy <= y1)
+                keys.append(((y0 + dy) * self.cols + x0 + dx)[covered])
+                indices.append(index[covered])
+        keys = np.concatenate(keys)
+        indices = np.concatenate(indices)
+        order = np.lexsort((indices, keys))
+        keys = keys[order]
+        indices = indices[order].tolist()
+        starts = np.flatnonzero(np.diff(keys, prepend=-1)).tolist()
+        self.cells = {key: indices[start:end]
+                      for key, start, end in zip(keys[starts].tolist(), starts, starts[1:] + [len(indices)])}
+
+    def remove(self, i):
+        if self.alive[i]:
+            self.alive[i] = 0
+            self.live -= 1
+
+    def query(self, x, y, w, h):
+        # Indices come back ascending so callers that stop at the first hit
+        # behave exactly like a linear scan over the original list
+        bounds = self.bounds
+        if bounds is None or x > bounds[2] or x + w < bounds[0] or y > bounds[3] or y + h < bounds[1]:
+            return []
+        x0, x1, y0, y1 = self._cell_range(x, y, w, h)
+        alive = self.alive
+        cells = self.cells
+        cols = self.cols
+        if x0 == x1 and y0 == y1:
+            return [i for i in cells.get(y0 * cols + x0, ()) if alive[i]]
+        found = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                found.update(cells.get(cy * cols + cx, ()))
+        return sorted(i for i in found if alive[i])
@@ -0,0 +1,224 @@
+# Table-driven special aliens. Each type's behaviour is a row of data in
+# BEHAVIOURS, and each type keeps its aliens in their own arrays so a tick's
+# update is a few vectorized ops per type instead of a branch per alien.
+import numpy as np
+from units import per_tick, ticks
+
+WIDTH, HEIGHT = 800, 600
+MAX_MINIS = 10
+
+# speed:       pixels per second moved down
+# sway:        pixels per second moved sideways, bouncing off the screen edges
+# fire_rate:   average shots per second, rolled each tick (after moving)
+# fire_every:  shoot once the timer passes this many seconds (before moving)
+# spawn_every: drop a mini-alien once the timer passes this many seconds
+# max_children: leave once this many of its mini-aliens are alive
+# hits / hit_score / kill_score: hit points and the score for a hit or kill
+# spawn:       start position, drawing from the game's random stream
+BEHAVIOURS = {
+    "kamikaze": {"speed": 180, "hits": 1, "kill_score": 30,
+                 "spawn": lambda rng: (rng.randint(50, WIDTH - 50), -30)},
+    "shield": {"speed": 60, "fire_rate": 2, "hits": 3, "hit_score": 10, "kill_score": 50,
+               "spawn": lambda rng: (rng.randint(50, WIDTH - 50), 100)},
+    "zigzag": {"speed": 120, "sway": 180, "fire_rate": 1, "hits": 1, "kill_score": 30,
+               "spawn": lambda rng: (50, -30)},
+    "sniper": {"speed": 30, "fire_every": 2, "hits": 1, "kill_score": 30,
+               "spawn": lambda rng: (rng.choice([0, WIDTH - 30]), 80)},
+    "spawner": {"spawn_every": 3, "max_children": 4, "hits": 1, "kill_score": 30,
+                "spawn": lambda rng: (rng.randint(100, WIDTH - 100), 60)},
+}
+TYPES = list(BEHAVIOURS)
+
+
+class AlienGroup:
+    def __init__(self, kind, capacity=8):
+        self.kind = kind
+        self.behaviour = BEHAVIOURS[kind]
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.direction = np.ones(capacity, dtype=np.int64)
+        self.dx = np.zeros(capacity)  # last tick's move, for drawing in between ticks
+        self.dy = np.zeros(capacity)
+        self.timer = np.zeros(capacity, dtype=np.int64)
+        self.hp = np.zeros(capacity, dtype=np.int64)
+        self.order = np.zeros(capacity, dtype=np.int64)  # global spawn order
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self.alive_count = 0
+
+    def add(self, x, y, order):
+        self.compact()
+        if self.count == len(self.x):
+            for name in ("x", "y", "direction", "dx", "dy", "timer", "hp", "order", "alive"):
+                old = getattr(self, name)
+                setattr(self, name, np.concatenate([old, np.zeros_like(old)]))
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.direction[i] = 1
+        self.dx[i] = 0
+        self.dy[i] = 0
+        self.timer[i] = 0
+        self.hp[i] = self.behaviour["hits"]
+        self.order[i] = order
+        self.alive[i] = True
+        self.count += 1
+        self.alive_count += 1
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.alive_count -= 1
+
+    def compact(self):
+        if self.count == self.alive_count:
+            return
+        keep = self.alive[:self.count]
+        m = self.alive_count
+        for name in ("x", "y", "direction", "dx", "dy", "timer", "hp", "order"):
+            column = getattr(self, name)
+            column[:m] = column[:self.count][keep]
+        self.alive[:m] = True
+        self.alive[m:self.count] = False
+        self.count = m
+
+    def update(self, state, children):
+        self.compact()
+        n = self.count
+        if n == 0:
+            return
+        behaviour = self.behaviour
+        x = self.x[:n]
+        y = self.y[:n]
+        alien_bullets = state.alien_bullets
+
+        fire_every = behaviour.get("fire_every")
+        if fire_every:
+            timer = self.timer[:n]
+            timer += 1
+            for i in np.flatnonzero(timer > ticks(fire_every)).tolist():
+                alien_bullets.spawn(float(x[i]) + 15, float(y[i]) + 20, 0)
+                timer[i] = 0
+
+        spawn_every = behaviour.get("spawn_every")
+        if spawn_every:
+            timer = self.timer[:n]
+            timer += 1
+            for i in np.flatnonzero(timer > ticks(spawn_every)).tolist():
+                if len(state.mini_aliens) < MAX_MINIS:
+                    parent = int(self.order[i])
+                    state.mini_aliens.append([float(x[i]), float(y[i]) + 20, parent])
+                    children[parent] = children.get(parent, 0) + 1
+                    timer[i] = 0
+
+        speed = behaviour.get("speed")
+        if speed:
+            self.dy[:n] = per_tick(speed)
+            y += per_tick(speed)
+        sway = behaviour.get("sway")
+        if sway:
+            direction = self.direction[:n]
+            dx = self.dx[:n]
+            dx[:] = direction * per_tick(sway)
+            x += dx
+            direction[(x <= 0) | (x >= WIDTH - 30)] *= -1
+        y[y > HEIGHT] = -30  # Respawn at top
+
+        fire_rate = behaviour.get("fire_rate")
+        if fire_rate:
+            fire_odds = ticks(1 / fire_rate)  # 1-in-N chance per tick
+            rng = state.rng
+            for i in range(n):
+                if rng.randint(1, fire_odds) == 1:
+                    alien_bullets.spawn(float(x[i]) + 15, float(y[i]) + 20, 0)
+
+        max_children = behaviour.get("max_children")
+        if max_children:
+            for i in range(n):
+                if children.get(int(self.order[i]), 0) >= max_children:
+                    self.kill(i)
+                    del children[int(self.order[i])]
+
+
+class SpecialAliens:
+    def __init__(self):
+        self.groups = {kind: AlienGroup(kind) for kind in TYPES}
+        self.children = {}  # spawner order -> live mini-aliens it dropped
+        self.next_order = 0
+
+    def __len__(self):
+        return sum(group.alive_count for group in self.groups.values())
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def spawn(self, rng):
+        kind = rng.choice(TYPES)
+        self.add(kind, *BEHAVIOURS[kind]["spawn"](rng))
+
+    def add(self, kind, x, y):
+        self.groups[kind].add(x, y, self.next_order)
+        self.next_order += 1
+
+    def update(self, state):
+        for group in self.groups.values():
+            group.update(state, self.children)
+        for group in self.groups.values():
+            group.compact()
+
+    def child_gone(self, parent):
+        # A spawner's mini-alien was shot or left the screen
+        if parent in self.children:
+            self.children[parent] -= 1
+
+    def handles(self):
+        # (group, slot) pairs for every live alien, in spawn order
+        handles = [(group, i) for group in self.groups.values() for i in range(group.count) if group.alive[i]]
+        handles.sort(key=lambda handle: handle[0].order[handle[1]])
+        return handles
+
+    def hit(self, handle):
+        # One hit on an alien; returns the score earned
+        group, i = handle
+        behaviour = group.behaviour
+        group.hp[i] -= 1
+        if group.hp[i] > 0:
+            return behaviour["hit_score"]
+        group.kill(i)
+        self.children.pop(int(group.order[i]), None)
+        return behaviour["kill_score"]
+
+    def compact(self):
+        for group in self.groups.values():
+            group.compact()
+
+    def overlaps(self, x, y, w, h):
+        for group in self.groups.values():
+            n = group.count
+            if n == 0:
+                continue
+            gx = group.x[:n]
+            gy = group.y[:n]
+            if (group.alive[:n] & (gx < x + w) & (gx + 30 > x) & (gy < y + h) & (gy + 20 > y)).any():
+                return True
+        return False
+
+    def positions(self, alpha=1.0):
+        # (kind, x, y) for drawing; alpha < 1 gives positions that far along
+        # each alien's last move
+        lag = 1 - alpha
+        for group in self.groups.values():
+            n = group.count
+            alive = group.alive[:n].tolist()
+            xs = group.x[:n] - group.dx[:n] * lag
+            ys = group.y[:n] - group.dy[:n] * lag
+            for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+                if alive[i]:
+                    yield group.kind, x, y
+
+    def snapshot(self):
+        return [(group.kind, group.order[:group.count].tolist(), group.x[:group.count].tolist(),
+                 group.y[:group.count].tolist(), group.direction[:group.count].tolist(),
+                 group.timer[:group.count].tolist(), group.hp[:group.count].tolist(),
+                 group.alive[:group.count].tolist())
+                for group in self.groups.values()]
@@ -0,0 +1,112 @@
+# Headless difficulty sweep: plays many scripted or random games per
+# difficulty level and seed across a process pool and writes one CSV row per
+# run (survival time, score and frame-time statistics).
+#
+#   python sweep.py --seeds 200 --policy scripted --output sweep.csv
+import argparse
+import csv
+import multiprocessing
+import random
+import time
+from game import GameState, Inputs, step, WIDTH
+from units import TICK_RATE
+
+FIELDS = ["difficulty", "seed", "policy", "frames", "seconds", "score", "won",
+          "mean_ms", "p95_ms", "max_ms"]
+
+
+def random_policy(state, rng):
+    return Inputs(rng.random() < 0.3, rng.random() < 0.3, 1 if rng.random() < 0.1 else 0)
+
+
+def scripted_policy(state, rng):
+    # Sidestep alien bullets about to land, otherwise line up under the
+    # nearest invader and fire at a steady cadence
+    centre = state.player_x + 15
+    for x, y, _ in state.alien_bullets:
+        if y > state.player_y - 120 and abs(x + 2 - centre) < 25:
+            dodge_left = x + 2 > centre and state.player_x > 0 or state.player_x >= WIDTH - 30
+            return Inputs(dodge_left, not dodge_left, 0)
+    left = right = False
+    if state.invaders:
+        target = min((x + 15 for x, _ in state.invaders.positions()), key=lambda x: abs(x - centre))
+        left = target < centre - 3
+        right = target > centre + 3
+    return Inputs(left, right, 1 if state.frame % 12 == 0 else 0)
+
+
+POLICIES = {"random": random_policy, "scripted": scripted_policy}
+
+
+def run_game(job):
+    difficulty, seed, policy_name, max_frames = job
+    state = GameState(difficulty=difficulty, seed=seed)
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed * 7919 + difficulty)
+    frame_times = []
+    clock = time.perf_counter
+    while not state.game_over and state.frame < max_frames:
+        inputs = policy(state, rng)
+        start = clock()
+        step(state, inputs)
+        frame_times.append(clock() - start)
+    frame_times.sort()
+    n = len(frame_times)
+    return {
+        "difficulty": difficulty,
+        "seed": seed,
+        "policy": policy_name,
+        "frames": state.frame,
+        "seconds": round(state.frame / TICK_RATE, 2),
+        "score": state.score,
+        "won": int(state.won),
+        "mean_ms": round(sum(frame_times) / n * 1000, 4) if n else 0,
+        "p95_ms": round(frame_times[min(n - 1, int(n * 0.95))] * 1000, 4) if n else 0,
+        "max_ms": round(frame_times[-1] * 1000, 4) if n else 0,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run headless Space Invaders games across difficulty levels")
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[1, 2, 3, 4, 5])
+    parser.add_argument("--seeds", type=int, default=50, help="games per difficulty")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--max-frames", type=int, default=TICK_RATE * 60 * 10, help="cap per game (default 10 minutes)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", default="sweep.csv")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    jobs = [(difficulty, seed, args.policy, args.max_frames)
+            for difficulty in args.difficulties
+            for seed in range(args.first_seed, args.first_seed + args.seeds)]
+
+    start = time.perf_counter()
+    results = []
+    with multiprocessing.Pool(args.workers) as pool:
+        for result in pool.imap_unordered(run_game, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))):
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: (r["difficulty"], r["seed"]))
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    total_frames = sum(r["frames"] for r in results)
+    print(f"{len(results)} games, {total_frames} frames in {elapsed:.1f}s "
+          f"({total_frames / TICK_RATE / 3600:.2f}h of gameplay) -> {args.output}")
+    for difficulty in args.difficulties:
+        runs = [r for r in results if r["difficulty"] == difficulty]
+        print(f"  difficulty {difficulty}: "
+              f"survival {sum(r['seconds'] for r in runs) / len(runs):.1f}s, "
+              f"score {sum(r['score'] for r in runs) / len(runs):.0f}, "
+              f"wins {sum(r['won'] for r in runs)}/{len(runs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# LRU cache of rendered text surfaces keyed by (font, string, colour), so
+# static labels and unchanged HUD values are rasterized once, not every frame.
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
@@ -0,0 +1,15 @@
+# Simulation time base. step() always advances the game by one fixed tick of
+# 1 / TICK_RATE seconds; speeds are written in pixels per second and
+# intervals in seconds, and converted to per-tick amounts with these helpers.
+TICK_RATE = 60
+DT = 1 / TICK_RATE
+
+
+def per_tick(speed):
+    # Pixels moved in one tick at `speed` pixels per second
+    return speed / TICK_RATE
+
+
+def ticks(seconds):
+    # Whole ticks in a duration
+    return round(seconds * TICK_RATE)